@@ -1,12 +1,22 @@
 """Market Analyzer - Real-time market data analysis and pattern recognition."""
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 
+def _mean_variance(prices: List[float]) -> Tuple[float, float]:
+    """Return the mean and population variance of a price window."""
+    if not prices:
+        return 0.0, 0.0
+    
+    mean = sum(prices) / len(prices)
+    variance = sum((p - mean) ** 2 for p in prices) / len(prices)
+    return mean, variance
+
+
 class MarketAnalyzer:
     """
     Advanced market analysis system for DeFi markets.
@@ -31,67 +41,61 @@ class MarketAnalyzer:
         Returns:
             Analysis results with trends, patterns, and opportunities
         """
+        # Shared 20-tick window statistics, computed once per tick
+        window = self.price_history[-20:]
+        mean, variance = _mean_variance(window)
+        momentum = self._calculate_momentum()
+        deviation = self._calculate_price_deviation(market_data, mean, variance)
+        
         analysis = {
             'timestamp': datetime.now().isoformat(),
             'price': market_data.get('price', 0),
             'volume': market_data.get('volume', 0),
-            'trend': self._analyze_trend(market_data),
-            'trend_strength': self._calculate_trend_strength(market_data),
-            'volatility': self._calculate_volatility(market_data),
-            'momentum': self._calculate_momentum(market_data),
-            'price_deviation': self._calculate_price_deviation(market_data),
+            'trend': self._analyze_trend(window),
+            'trend_strength': self._calculate_trend_strength(),
+            'volatility': self._calculate_volatility(mean, variance),
+            'momentum': momentum,
+            'price_deviation': deviation,
             'liquidity': market_data.get('liquidity', 0),
-            'opportunities': self._identify_opportunities(market_data)
+            'opportunities': self._identify_opportunities(market_data, deviation, momentum)
         }
         
         self._update_history(market_data)
         return analysis
     
-    def _analyze_trend(self, market_data: Dict[str, Any]) -> float:
+    def _analyze_trend(self, window: List[float]) -> float:
         """
         Analyze price trend direction.
         
         Returns:
             Positive value for uptrend, negative for downtrend
         """
-        if len(self.price_history) < 2:
+        if len(window) < 2:
             return 0.0
         
-        recent_prices = self.price_history[-20:] if len(self.price_history) >= 20 else self.price_history
-        if len(recent_prices) < 2:
-            return 0.0
-        
-        trend = (recent_prices[-1] - recent_prices[0]) / recent_prices[0]
+        trend = (window[-1] - window[0]) / window[0]
         return trend
     
-    def _calculate_trend_strength(self, market_data: Dict[str, Any]) -> float:
+    def _calculate_trend_strength(self) -> float:
         """Calculate the strength of the current trend."""
         if len(self.price_history) < 5:
             return 0.0
         
-        recent_prices = self.price_history[-10:] if len(self.price_history) >= 10 else self.price_history
-        avg_price = sum(recent_prices) / len(recent_prices)
-        variance = sum((p - avg_price) ** 2 for p in recent_prices) / len(recent_prices)
+        avg_price, variance = _mean_variance(self.price_history[-10:])
         
         strength = min(variance / (avg_price ** 2) * 100, 1.0) if avg_price > 0 else 0.0
         return strength
     
-    def _calculate_volatility(self, market_data: Dict[str, Any]) -> float:
-        """Calculate market volatility."""
+    def _calculate_volatility(self, avg_price: float, variance: float) -> float:
+        """Calculate market volatility from the recent window statistics."""
         if len(self.price_history) < 2:
             return 0.0
         
-        recent_prices = self.price_history[-20:] if len(self.price_history) >= 20 else self.price_history
-        if len(recent_prices) < 2:
-            return 0.0
-        
-        avg_price = sum(recent_prices) / len(recent_prices)
-        variance = sum((p - avg_price) ** 2 for p in recent_prices) / len(recent_prices)
         volatility = (variance ** 0.5) / avg_price if avg_price > 0 else 0.0
         
         return volatility
     
-    def _calculate_momentum(self, market_data: Dict[str, Any]) -> float:
+    def _calculate_momentum(self) -> float:
         """Calculate price momentum."""
         if len(self.price_history) < 5:
             return 0.0
@@ -100,21 +104,25 @@ class MarketAnalyzer:
         momentum = (recent_prices[-1] - recent_prices[0]) / recent_prices[0] if recent_prices[0] > 0 else 0.0
         return momentum
     
-    def _calculate_price_deviation(self, market_data: Dict[str, Any]) -> float:
+    def _calculate_price_deviation(self,
+                                   market_data: Dict[str, Any],
+                                   avg_price: float,
+                                   variance: float) -> float:
         """Calculate deviation from moving average."""
         if len(self.price_history) < 10:
             return 0.0
         
-        recent_prices = self.price_history[-20:] if len(self.price_history) >= 20 else self.price_history
-        avg_price = sum(recent_prices) / len(recent_prices)
         current_price = market_data.get('price', avg_price)
         
-        std_dev = (sum((p - avg_price) ** 2 for p in recent_prices) / len(recent_prices)) ** 0.5
+        std_dev = variance ** 0.5
         deviation = (current_price - avg_price) / std_dev if std_dev > 0 else 0.0
         
         return deviation
     
-    def _identify_opportunities(self, market_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _identify_opportunities(self,
+                                market_data: Dict[str, Any],
+                                deviation: float,
+                                momentum: float) -> List[Dict[str, Any]]:
         """Identify trading opportunities based on analysis."""
         opportunities = []
         
@@ -131,7 +139,6 @@ class MarketAnalyzer:
                 })
         
         # Check for mean reversion opportunity
-        deviation = self._calculate_price_deviation(market_data)
         if abs(deviation) > 2.0:
             opportunities.append({
                 'type': 'mean_reversion',
@@ -140,7 +147,6 @@ class MarketAnalyzer:
             })
         
         # Check for momentum opportunity
-        momentum = self._calculate_momentum(market_data)
         if abs(momentum) > 0.05:
             opportunities.append({
                 'type': 'momentum',
@@ -1,10 +1,17 @@
 """Risk Manager - Portfolio protection and position sizing."""
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, Hashable, List, Any, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Sign applied to price moves when marking a position to market
+_DIRECTIONS = {'buy': 1, 'sell': -1}
+
+# Trade approval limits
+_MIN_POSITION_SIZE = 0.001
+_MAX_TOTAL_EXPOSURE = 0.8
+
 
 class RiskLevel(str):
     """Risk level classifications."""
@@ -33,6 +40,15 @@ class RiskManager:
         self.max_portfolio_risk = max_portfolio_risk
         self.max_position_size = max_position_size
         self.active_positions = {}
+        
+        # Slot-indexed columns for open positions; closed slots are recycled
+        self._slot_by_id: Dict[Hashable, int] = {}
+        self._slot_ids: List[Optional[Hashable]] = []
+        self._slot_size: List[float] = []
+        self._slot_entry: List[float] = []
+        self._slot_direction: List[int] = []
+        self._free_slots: List[int] = []
+        
         self.portfolio_value = 0
         self.total_exposure = 0
         logger.info(f"Risk Manager initialized (max risk: {max_portfolio_risk*100}%, max position: {max_position_size*100}%)")
@@ -62,7 +78,7 @@ class RiskManager:
         stop_loss = self._calculate_stop_loss(volatility, strategy_type)
         
         # Calculate take profit
-        take_profit = self._calculate_take_profit(volatility, strategy_type)
+        take_profit = self._calculate_take_profit(stop_loss)
         
         assessment = {
             'risk_level': risk_level,
@@ -147,10 +163,9 @@ class RiskManager:
         
         return min(stop_loss, 0.1)  # Max 10% stop loss
     
-    def _calculate_take_profit(self, volatility: float, strategy_type: str) -> float:
-        """Calculate take profit percentage."""
+    def _calculate_take_profit(self, stop_loss: float) -> float:
+        """Calculate take profit percentage from the trade's stop loss."""
         # Target risk-reward ratio of at least 2:1
-        stop_loss = self._calculate_stop_loss(volatility, strategy_type)
         take_profit = stop_loss * 2.5
         
         return min(take_profit, 0.25)  # Max 25% take profit
@@ -158,7 +173,7 @@ class RiskManager:
     def _approve_trade(self, position_size: float, risk_level: str) -> bool:
         """Approve or reject trade based on risk parameters."""
         # Don't trade if position size is too small
-        if position_size < 0.001:
+        if position_size < _MIN_POSITION_SIZE:
             logger.warning("Trade rejected: Position size too small")
             return False
         
@@ -168,29 +183,82 @@ class RiskManager:
             return False
         
         # Don't exceed total exposure limit
-        if self.total_exposure + position_size > 0.8:
+        if self.total_exposure + position_size > _MAX_TOTAL_EXPOSURE:
             logger.warning("Trade rejected: Would exceed exposure limit")
             return False
         
         return True
     
+    def has_capacity(self) -> bool:
+        """Check whether any new trade could still pass the exposure limits."""
+        return self.total_exposure + _MIN_POSITION_SIZE <= _MAX_TOTAL_EXPOSURE
+    
     def update_portfolio(self, portfolio_value: float):
         """Update current portfolio value."""
         self.portfolio_value = portfolio_value
         logger.info(f"Portfolio value updated: ${portfolio_value:,.2f}")
     
-    def open_position(self, position_id: str, position_data: Dict[str, Any]):
+    def open_position(self, position_id: Hashable, position_data: Dict[str, Any]):
         """Register a new open position."""
+        if position_id in self.active_positions:
+            self.close_position(position_id)
+        
+        size = position_data.get('size', 0)
         self.active_positions[position_id] = position_data
-        self.total_exposure += position_data.get('size', 0)
-        logger.info(f"Position opened: {position_id}")
+        self.total_exposure += size
+        
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            slot = len(self._slot_ids)
+            self._slot_ids.append(None)
+            self._slot_size.append(0.0)
+            self._slot_entry.append(0.0)
+            self._slot_direction.append(0)
+        
+        self._slot_by_id[position_id] = slot
+        self._slot_ids[slot] = position_id
+        self._slot_size[slot] = size
+        self._slot_entry[slot] = position_data.get('entry_price', 0.0)
+        self._slot_direction[slot] = _DIRECTIONS.get(position_data.get('signal'), 0)
+        
+        logger.info("Position opened: %s", position_id)
     
-    def close_position(self, position_id: str):
+    def close_position(self, position_id: Hashable):
         """Close and remove a position."""
         if position_id in self.active_positions:
             position = self.active_positions.pop(position_id)
             self.total_exposure -= position.get('size', 0)
-            logger.info(f"Position closed: {position_id}")
+            
+            slot = self._slot_by_id.pop(position_id)
+            self._slot_ids[slot] = None
+            self._slot_size[slot] = 0.0
+            self._slot_direction[slot] = 0
+            self._free_slots.append(slot)
+            
+            logger.info("Position closed: %s", position_id)
+    
+    def mark_to_market(self, current_price: float) -> Dict[Hashable, float]:
+        """
+        Compute unrealized PnL of every open position at the current price.
+        
+        Args:
+            current_price: Current market price
+            
+        Returns:
+            Unrealized PnL per position id, as a fraction of the portfolio
+        """
+        pnl = {}
+        for position_id, size, entry, direction in zip(self._slot_ids, self._slot_size,
+                                                        self._slot_entry, self._slot_direction):
+            if position_id is None:
+                continue
+            if entry > 0 and direction:
+                pnl[position_id] = size * direction * (current_price - entry) / entry
+            else:
+                pnl[position_id] = 0.0
+        
+        return pnl
     
     def get_portfolio_status(self) -> Dict[str, Any]:
         """Get current portfolio risk status."""
@@ -1,6 +1,6 @@
 """Strategy Engine - Core trading strategy execution system."""
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from enum import Enum
 import logging
 
@@ -44,13 +44,31 @@ class StrategyEngine:
             strategy_type: Type of strategy to register
             params: Strategy-specific parameters
         """
-        self.active_strategies[strategy_type.value] = {
+        self.active_strategies[strategy_type.value] = self._make_strategy_entry(strategy_type, params)
+        logger.info(f"Registered strategy: {strategy_type.value}")
+    
+    def register_strategies(self, strategies: List[Tuple[StrategyType, Dict[str, Any]]]):
+        """
+        Register several trading strategies in one call.
+        
+        Args:
+            strategies: (strategy type, parameters) pairs to register
+        """
+        self.active_strategies.update(
+            (strategy_type.value, self._make_strategy_entry(strategy_type, params))
+            for strategy_type, params in strategies
+        )
+        logger.info("Registered strategies: %s", ", ".join(t.value for t, _ in strategies))
+    
+    @staticmethod
+    def _make_strategy_entry(strategy_type: StrategyType, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the registry entry for a strategy."""
+        return {
             'type': strategy_type,
             'params': params,
             'enabled': True,
             'performance': {'total_profit': 0, 'trades': 0, 'win_rate': 0}
         }
-        logger.info(f"Registered strategy: {strategy_type.value}")
     
     def execute_strategy(self, strategy_type: StrategyType, market_data: Dict[str, Any]) -> Signal:
         """
@@ -63,24 +81,24 @@ class StrategyEngine:
         Returns:
             Trading signal (BUY, SELL, or HOLD)
         """
-        if strategy_type.value not in self.active_strategies:
+        strategy = self.active_strategies.get(strategy_type.value)
+        if strategy is None:
             logger.warning(f"Strategy {strategy_type.value} not registered")
             return Signal.HOLD
         
-        strategy = self.active_strategies[strategy_type.value]
         if not strategy['enabled']:
             return Signal.HOLD
         
         # Execute strategy logic based on type
-        if strategy_type == StrategyType.ARBITRAGE:
+        if strategy_type is StrategyType.ARBITRAGE:
             return self._execute_arbitrage(market_data, strategy['params'])
-        elif strategy_type == StrategyType.TREND_FOLLOWING:
+        elif strategy_type is StrategyType.TREND_FOLLOWING:
             return self._execute_trend_following(market_data, strategy['params'])
-        elif strategy_type == StrategyType.MEAN_REVERSION:
+        elif strategy_type is StrategyType.MEAN_REVERSION:
             return self._execute_mean_reversion(market_data, strategy['params'])
-        elif strategy_type == StrategyType.MOMENTUM:
+        elif strategy_type is StrategyType.MOMENTUM:
             return self._execute_momentum(market_data, strategy['params'])
-        elif strategy_type == StrategyType.LIQUIDITY_PROVISION:
+        elif strategy_type is StrategyType.LIQUIDITY_PROVISION:
             return self._execute_liquidity_provision(market_data, strategy['params'])
         
         return Signal.HOLD
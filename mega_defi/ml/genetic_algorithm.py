@@ -8,10 +8,25 @@ from typing import Dict, List, Any, Callable, Optional
 import logging
 import random
 import copy
+from concurrent.futures import Executor, ProcessPoolExecutor
 
 logger = logging.getLogger(__name__)
 
 
+class _SafeFitness:
+    """Picklable fitness wrapper that scores failed evaluations as -inf."""
+    
+    def __init__(self, backtest_function: Callable[[Dict[str, Any]], float]):
+        self.backtest_function = backtest_function
+    
+    def __call__(self, params: Dict[str, Any]) -> float:
+        try:
+            return self.backtest_function(params)
+        except Exception as e:
+            logger.error(f"Error evaluating parameters: {e}")
+            return float('-inf')
+
+
 class GeneticAlgorithmTuner:
     """
     Genetic Algorithm optimizer for strategy parameter tuning.
@@ -29,7 +44,11 @@ class GeneticAlgorithmTuner:
         mutation_rate: float = 0.1,
         crossover_rate: float = 0.7,
         elite_size: int = 5,
-        max_generations: int = 100
+        max_generations: int = 100,
+        patience: Optional[int] = 15,
+        tol: float = 1e-6,
+        n_workers: int = 1,
+        seed: Optional[int] = None
     ):
         """
         Initialize the genetic algorithm tuner.
@@ -40,18 +59,30 @@ class GeneticAlgorithmTuner:
             crossover_rate: Probability of crossover
             elite_size: Number of top performers to keep
             max_generations: Maximum number of generations
+            patience: Generations without improvement before stopping early (None disables)
+            tol: Minimum best-fitness gain that counts as an improvement
+            n_workers: Worker processes for fitness evaluation (1 evaluates serially;
+                fitness functions must be picklable when greater than 1)
+            seed: Optional seed for reproducible runs
         """
         self.population_size = population_size
         self.mutation_rate = mutation_rate
         self.crossover_rate = crossover_rate
         self.elite_size = elite_size
         self.max_generations = max_generations
+        self.patience = patience
+        self.tol = tol
+        self.n_workers = n_workers
+        self._rng = random.Random(seed)
         
         self.population = []
         self.best_individual = None
         self.best_fitness = float('-inf')
         self.generation = 0
+        self._stagnation_counter = 0
+        self._int_params: frozenset = frozenset()
         self.fitness_history = []
+        self._best_history: List[float] = []  # per-generation best, parallel to fitness_history
         
         logger.info("Genetic Algorithm Tuner initialized")
     
@@ -72,17 +103,47 @@ class GeneticAlgorithmTuner:
         Returns:
             Best parameters found
         """
+        # Integer-valued parameters are fixed for the run; classify them once
+        self._int_params = frozenset(
+            name for name, (min_val, max_val) in parameter_space.items()
+            if isinstance(min_val, int) and isinstance(max_val, int)
+        )
+        
         # Initialize population
         self.population = self._initialize_population(parameter_space)
+        self._stagnation_counter = 0
         
+        # One pool for the whole run so workers are not respawned per generation
+        pool = ProcessPoolExecutor(max_workers=self.n_workers) if self.n_workers > 1 else None
+        try:
+            return self._run_generations(parameter_space, fitness_function, target_fitness, pool)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+    
+    def _run_generations(
+        self,
+        parameter_space: Dict[str, tuple],
+        fitness_function: Callable[[Dict[str, Any]], float],
+        target_fitness: Optional[float],
+        pool: Optional[Executor]
+    ) -> Dict[str, Any]:
+        """Evolve the population until a stop condition is met."""
         for generation in range(self.max_generations):
             self.generation = generation
+            previous_best = self.best_fitness
             
-            # Evaluate fitness
-            fitness_scores = []
-            for individual in self.population:
-                fitness = fitness_function(individual)
-                fitness_scores.append(fitness)
+            # Evaluate fitness, folding generation statistics into the same pass
+            fitness_scores = self._evaluate_population(fitness_function, pool)
+            gen_sum = 0.0
+            gen_best = float('-inf')
+            gen_worst = float('inf')
+            for individual, fitness in zip(self.population, fitness_scores):
+                gen_sum += fitness
+                if fitness < gen_worst:
+                    gen_worst = fitness
+                if fitness > gen_best:
+                    gen_best = fitness
                 
                 # Track best individual
                 if fitness > self.best_fitness:
@@ -90,21 +151,32 @@ class GeneticAlgorithmTuner:
                     self.best_individual = copy.deepcopy(individual)
             
             # Record generation statistics
-            avg_fitness = sum(fitness_scores) / len(fitness_scores)
+            avg_fitness = gen_sum / len(fitness_scores)
             self.fitness_history.append({
                 'generation': generation,
-                'best': max(fitness_scores),
+                'best': gen_best,
                 'average': avg_fitness,
-                'worst': min(fitness_scores)
+                'worst': gen_worst
             })
+            self._best_history.append(gen_best)
             
-            logger.debug(f"Generation {generation}: best={max(fitness_scores):.4f}, avg={avg_fitness:.4f}")
+            logger.debug(f"Generation {generation}: best={gen_best:.4f}, avg={avg_fitness:.4f}")
             
             # Check if target reached
-            if target_fitness and max(fitness_scores) >= target_fitness:
+            if target_fitness and gen_best >= target_fitness:
                 logger.info(f"Target fitness {target_fitness} reached at generation {generation}")
                 break
             
+            # Stop once the best fitness has plateaued
+            if self.best_fitness - previous_best > self.tol:
+                self._stagnation_counter = 0
+            else:
+                self._stagnation_counter += 1
+            
+            if self.patience is not None and self._stagnation_counter >= self.patience:
+                logger.info(f"Converged at generation {generation} after {self.patience} stagnant generations")
+                break
+            
             # Create next generation
             self.population = self._evolve_population(
                 self.population,
@@ -115,6 +187,18 @@ class GeneticAlgorithmTuner:
         logger.info(f"Optimization complete. Best fitness: {self.best_fitness:.4f}")
         return self.best_individual
     
+    def _evaluate_population(
+        self,
+        fitness_function: Callable[[Dict[str, Any]], float],
+        pool: Optional[Executor]
+    ) -> List[float]:
+        """Score the current population, fanning out to the worker pool if present."""
+        if pool is None:
+            return [fitness_function(individual) for individual in self.population]
+        
+        chunksize = max(1, len(self.population) // self.n_workers)
+        return list(pool.map(fitness_function, self.population, chunksize=chunksize))
+    
     def tune_strategy_parameters(
         self,
         strategy_name: str,
@@ -134,15 +218,7 @@ class GeneticAlgorithmTuner:
         """
         logger.info(f"Tuning parameters for {strategy_name}")
         
-        def fitness_wrapper(params: Dict[str, Any]) -> float:
-            """Wrapper to evaluate strategy performance."""
-            try:
-                return backtest_function(params)
-            except Exception as e:
-                logger.error(f"Error evaluating parameters: {e}")
-                return float('-inf')
-        
-        optimized = self.optimize(parameter_ranges, fitness_wrapper)
+        optimized = self.optimize(parameter_ranges, _SafeFitness(backtest_function))
         
         logger.info(f"Optimized {strategy_name} parameters: {optimized}")
         return optimized
@@ -150,15 +226,18 @@ class GeneticAlgorithmTuner:
     def _initialize_population(self, parameter_space: Dict[str, tuple]) -> List[Dict[str, Any]]:
         """Initialize random population within parameter space."""
         population = []
+        randint = self._rng.randint
+        uniform = self._rng.uniform
+        int_params = self._int_params
         
         for _ in range(self.population_size):
             individual = {}
             for param_name, (min_val, max_val) in parameter_space.items():
                 # Generate random value in range
-                if isinstance(min_val, int) and isinstance(max_val, int):
-                    individual[param_name] = random.randint(min_val, max_val)
+                if param_name in int_params:
+                    individual[param_name] = randint(min_val, max_val)
                 else:
-                    individual[param_name] = random.uniform(min_val, max_val)
+                    individual[param_name] = uniform(min_val, max_val)
             
             population.append(individual)
         
@@ -179,19 +258,20 @@ class GeneticAlgorithmTuner:
         new_population = [ind for ind, _ in scored_population[:self.elite_size]]
         
         # Generate offspring
+        rand = self._rng.random
         while len(new_population) < self.population_size:
             # Tournament selection
             parent1 = self._tournament_selection(scored_population)
             parent2 = self._tournament_selection(scored_population)
             
             # Crossover
-            if random.random() < self.crossover_rate:
+            if rand() < self.crossover_rate:
                 child = self._crossover(parent1, parent2)
             else:
                 child = copy.deepcopy(parent1)
             
             # Mutation
-            if random.random() < self.mutation_rate:
+            if rand() < self.mutation_rate:
                 child = self._mutate(child, parameter_space)
             
             new_population.append(child)
@@ -204,7 +284,7 @@ class GeneticAlgorithmTuner:
         tournament_size: int = 3
     ) -> Dict[str, Any]:
         """Select individual using tournament selection."""
-        tournament = random.sample(scored_population, min(tournament_size, len(scored_population)))
+        tournament = self._rng.sample(scored_population, min(tournament_size, len(scored_population)))
         winner = max(tournament, key=lambda x: x[1])
         return winner[0]
     
@@ -215,10 +295,11 @@ class GeneticAlgorithmTuner:
     ) -> Dict[str, Any]:
         """Perform crossover between two parents."""
         child = {}
+        rand = self._rng.random
         
         for param_name in parent1.keys():
             # Randomly choose from either parent
-            if random.random() < 0.5:
+            if rand() < 0.5:
                 child[param_name] = parent1[param_name]
             else:
                 child[param_name] = parent2[param_name]
@@ -234,17 +315,17 @@ class GeneticAlgorithmTuner:
         mutated = copy.deepcopy(individual)
         
         # Select random parameter to mutate
-        param_to_mutate = random.choice(list(parameter_space.keys()))
+        param_to_mutate = self._rng.choice(list(parameter_space.keys()))
         min_val, max_val = parameter_space[param_to_mutate]
         
         # Apply mutation
-        if isinstance(min_val, int) and isinstance(max_val, int):
+        if param_to_mutate in self._int_params:
             # For integers, random reset
-            mutated[param_to_mutate] = random.randint(min_val, max_val)
+            mutated[param_to_mutate] = self._rng.randint(min_val, max_val)
         else:
             # For floats, add Gaussian noise
             current_val = mutated[param_to_mutate]
-            mutation = random.gauss(0, (max_val - min_val) * 0.1)
+            mutation = self._rng.gauss(0, (max_val - min_val) * 0.1)
             mutated[param_to_mutate] = max(min_val, min(max_val, current_val + mutation))
         
         return mutated
@@ -273,16 +354,19 @@ class GeneticAlgorithmTuner:
     
     def _calculate_convergence(self) -> float:
         """Calculate convergence metric (0-1, higher is more converged)."""
-        if len(self.fitness_history) < 2:
+        history = self._best_history
+        if len(history) < 2:
             return 0.0
         
         # Compare recent generations
-        recent = 10
-        if len(self.fitness_history) < recent:
-            recent = len(self.fitness_history)
+        recent = min(10, len(history))
+        best = self.best_fitness
         
-        recent_best = [gen['best'] for gen in self.fitness_history[-recent:]]
-        variance = sum((x - self.best_fitness) ** 2 for x in recent_best) / recent
+        variance = 0.0
+        for x in history[-recent:]:
+            diff = x - best
+            variance += diff * diff
+        variance /= recent
         
         # Lower variance = higher convergence
         convergence = 1.0 / (1.0 + variance)
@@ -4,13 +4,68 @@ This module implements a Q-Learning based approach to optimize trading strategie
 by learning from market feedback and maximizing cumulative rewards.
 """
 
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Callable, Optional, Tuple
 import logging
-from collections import defaultdict
 import random
+from bisect import bisect_right
+from collections import deque
 
 logger = logging.getLogger(__name__)
 
+# Discretization boundaries and precomputed state labels
+_PRICE_BINS = (100, 1000)
+_VOL_BINS = (0.1, 0.3)
+_TREND_BINS = (-0.05, 0.05)
+_STATE_LABELS = tuple(
+    tuple(
+        tuple(f"{p}_{v}_{t}" for t in ("down", "neutral", "up"))
+        for v in ("low", "medium", "high")
+    )
+    for p in ("low", "medium", "high")
+)
+
+# Tunable parameter -> adjustment actions it enables
+_PARAM_ACTIONS = {
+    'threshold': ('increase_threshold', 'decrease_threshold', 'keep_threshold'),
+    'position_size': ('increase_size', 'decrease_size', 'keep_size'),
+    'stop_loss': ('tighten_stop', 'loosen_stop', 'keep_stop'),
+}
+
+# Action -> (parameter, clamped adjustment); keep_* and no_change are no-ops
+_ACTION_HANDLERS: Dict[str, Tuple[str, Callable[[float], float]]] = {
+    'increase_threshold': ('threshold', lambda v: min(v * 1.1, 1.0)),
+    'decrease_threshold': ('threshold', lambda v: max(v * 0.9, 0.001)),
+    'increase_size': ('position_size', lambda v: min(v * 1.1, 1.0)),
+    'decrease_size': ('position_size', lambda v: max(v * 0.9, 0.01)),
+    'tighten_stop': ('stop_loss', lambda v: max(v * 0.9, 0.01)),
+    'loosen_stop': ('stop_loss', lambda v: min(v * 1.1, 0.2)),
+}
+
+
+def _q_update(
+    row: List[float],
+    aid: int,
+    reward: float,
+    next_row: Optional[List[float]],
+    next_aids: List[int],
+    learning_rate: float,
+    discount_factor: float
+) -> float:
+    """Apply one Q-learning step to ``row[aid]`` and return the new Q-value."""
+    # Max Q-value for next state (unvisited states are all zero)
+    max_next_q = 0.0
+    if next_row is not None and next_aids:
+        max_next_q = next_row[next_aids[0]]
+        for next_aid in next_aids:
+            q = next_row[next_aid]
+            if q > max_next_q:
+                max_next_q = q
+    
+    current_q = row[aid]
+    new_q = current_q + learning_rate * (reward + discount_factor * max_next_q - current_q)
+    row[aid] = new_q
+    return new_q
+
 
 class ReinforcementLearningOptimizer:
     """
@@ -26,7 +81,9 @@ class ReinforcementLearningOptimizer:
         discount_factor: float = 0.95,
         exploration_rate: float = 0.2,
         min_exploration: float = 0.01,
-        exploration_decay: float = 0.995
+        exploration_decay: float = 0.995,
+        seed: Optional[int] = None,
+        max_episode_history: int = 10_000
     ):
         """
         Initialize the RL optimizer.
@@ -37,18 +94,30 @@ class ReinforcementLearningOptimizer:
             exploration_rate: Initial exploration rate (epsilon)
             min_exploration: Minimum exploration rate
             exploration_decay: Decay rate for exploration
+            seed: Optional seed for reproducible action selection
+            max_episode_history: Number of most recent episode rewards to retain
         """
         self.learning_rate = learning_rate
         self.discount_factor = discount_factor
         self.exploration_rate = exploration_rate
         self.min_exploration = min_exploration
         self.exploration_decay = exploration_decay
+        self._rng = random.Random(seed)
+        
+        # Dense Q-table: rows indexed by interned state id, columns by action id
+        self._state_ids: Dict[str, int] = {}
+        self._action_ids: Dict[str, int] = {}
+        self._q: List[List[float]] = []
         
-        # Q-table: state -> action -> Q-value
-        self.q_table = defaultdict(lambda: defaultdict(float))
+        # Available actions keyed by the set of tunable parameters present
+        self._action_cache: Dict[frozenset, Tuple[str, ...]] = {}
         
         # Performance tracking
-        self.episode_rewards = []
+        self.episode_rewards = deque(maxlen=max_episode_history)
+        self._episode_count = 0
+        self._reward_sum = 0.0
+        self._recent_rewards = deque(maxlen=100)
+        self._reward_sum_recent = 0.0
         self.training_steps = 0
         
         logger.info("Reinforcement Learning Optimizer initialized")
@@ -65,16 +134,29 @@ class ReinforcementLearningOptimizer:
             Selected action
         """
         # Exploration: random action
-        if random.random() < self.exploration_rate:
-            return random.choice(available_actions)
-        
-        # Exploitation: best known action
-        q_values = {action: self.q_table[state][action] for action in available_actions}
-        max_q = max(q_values.values()) if q_values else 0
-        
-        # Get all actions with max Q-value (for tie-breaking)
-        best_actions = [action for action, q in q_values.items() if q == max_q]
-        return random.choice(best_actions)
+        if self._rng.random() < self.exploration_rate:
+            return self._rng.choice(available_actions)
+        
+        # Unvisited state: every action ties at zero
+        sid = self._state_ids.get(state)
+        if sid is None:
+            return self._rng.choice(available_actions)
+        
+        # Exploitation: best known action, collecting ties in a single pass
+        row = self._q[sid]
+        action_ids = self._action_ids
+        best_q = float('-inf')
+        best_actions = []
+        for action in available_actions:
+            aid = action_ids.get(action)
+            q = row[aid] if aid is not None else 0.0
+            if q > best_q:
+                best_q = q
+                best_actions = [action]
+            elif q == best_q:
+                best_actions.append(action)
+        
+        return self._rng.choice(best_actions)
     
     def update(
         self,
@@ -94,22 +176,17 @@ class ReinforcementLearningOptimizer:
             next_state: Next state
             available_next_actions: Available actions in next state
         """
-        # Get current Q-value
-        current_q = self.q_table[state][action]
-        
-        # Get max Q-value for next state
-        if available_next_actions:
-            next_q_values = [self.q_table[next_state][a] for a in available_next_actions]
-            max_next_q = max(next_q_values) if next_q_values else 0
-        else:
-            max_next_q = 0
-        
-        # Q-learning update
-        new_q = current_q + self.learning_rate * (
-            reward + self.discount_factor * max_next_q - current_q
+        # Intern ids, then hand the arithmetic to the update kernel
+        row = self._q[self._intern_state(state)]
+        aid = self._intern_action(action)
+        next_aids = [self._intern_action(a) for a in available_next_actions]
+        next_sid = self._state_ids.get(next_state)
+        next_row = self._q[next_sid] if next_sid is not None else None
+        
+        _q_update(
+            row, aid, reward, next_row, next_aids,
+            self.learning_rate, self.discount_factor
         )
-        
-        self.q_table[state][action] = new_q
         self.training_steps += 1
         
         # Decay exploration rate
@@ -118,6 +195,32 @@ class ReinforcementLearningOptimizer:
             self.exploration_rate * self.exploration_decay
         )
     
+    @property
+    def q_table(self) -> Dict[str, Dict[str, float]]:
+        """Snapshot of the Q-table as nested state -> action -> Q-value dicts."""
+        actions = self._action_ids.items()
+        return {
+            state: {action: self._q[sid][aid] for action, aid in actions}
+            for state, sid in self._state_ids.items()
+        }
+    
+    def _intern_state(self, state: str) -> int:
+        """Return the row id for a state, allocating a zeroed row on first sight."""
+        sid = self._state_ids.get(state)
+        if sid is None:
+            sid = self._state_ids[state] = len(self._q)
+            self._q.append([0.0] * len(self._action_ids))
+        return sid
+    
+    def _intern_action(self, action: str) -> int:
+        """Return the column id for an action, widening every row on first sight."""
+        aid = self._action_ids.get(action)
+        if aid is None:
+            aid = self._action_ids[action] = len(self._action_ids)
+            for row in self._q:
+                row.append(0.0)
+        return aid
+    
     def optimize_strategy_parameters(
         self,
         strategy_name: str,
@@ -194,46 +297,56 @@ class ReinforcementLearningOptimizer:
         self.update(state, action_taken, reward, next_state, available_actions)
         
         # Track episode reward
-        self.episode_rewards.append(reward)
+        self._record_episode_reward(reward)
         
         logger.debug(f"Learned from trade: reward={reward:.4f}, exploration={self.exploration_rate:.4f}")
     
+    def _record_episode_reward(self, reward: float) -> None:
+        """Store an episode reward and update the running aggregates."""
+        self.episode_rewards.append(reward)
+        self._episode_count += 1
+        self._reward_sum += reward
+        
+        # Rolling window over the last 100 rewards
+        recent = self._recent_rewards
+        if len(recent) == recent.maxlen:
+            self._reward_sum_recent -= recent[0]
+        recent.append(reward)
+        self._reward_sum_recent += reward
+    
     def _create_state_representation(self, market_data: Dict[str, Any]) -> str:
         """Create a discrete state representation from market data."""
-        # Discretize continuous values
-        price = market_data.get('price', 0)
-        volatility = market_data.get('volatility', 0)
-        trend = market_data.get('trend', 0)
+        # Bucket each continuous value and index the precomputed label table
+        price_bucket = bisect_right(_PRICE_BINS, market_data.get('price', 0))
+        vol_bucket = bisect_right(_VOL_BINS, market_data.get('volatility', 0))
+        trend_bucket = bisect_right(_TREND_BINS, market_data.get('trend', 0))
         
-        # Create buckets
-        price_bucket = "low" if price < 100 else "medium" if price < 1000 else "high"
-        vol_bucket = "low" if volatility < 0.1 else "medium" if volatility < 0.3 else "high"
-        trend_bucket = "down" if trend < -0.05 else "neutral" if trend < 0.05 else "up"
-        
-        return f"{price_bucket}_{vol_bucket}_{trend_bucket}"
+        return _STATE_LABELS[price_bucket][vol_bucket][trend_bucket]
     
     def _get_parameter_actions(
         self,
         strategy_name: str,
         current_params: Dict[str, Any]
-    ) -> List[str]:
+    ) -> Tuple[str, ...]:
         """Get available parameter adjustment actions."""
-        actions = []
-        
-        # Generic parameter adjustments
-        if 'threshold' in current_params:
-            actions.extend(['increase_threshold', 'decrease_threshold', 'keep_threshold'])
-        
-        if 'position_size' in current_params:
-            actions.extend(['increase_size', 'decrease_size', 'keep_size'])
-        
-        if 'stop_loss' in current_params:
-            actions.extend(['tighten_stop', 'loosen_stop', 'keep_stop'])
+        # The action set depends only on which tunable parameters are present
+        key = frozenset(current_params.keys() & _PARAM_ACTIONS.keys())
+        actions = self._action_cache.get(key)
+        if actions is not None:
+            return actions
+        
+        # Generic parameter adjustments, in a stable parameter order
+        actions = tuple(
+            action
+            for param, param_actions in _PARAM_ACTIONS.items() if param in key
+            for action in param_actions
+        )
         
         # Default action
         if not actions:
-            actions.append('no_change')
+            actions = ('no_change',)
         
+        self._action_cache[key] = actions
         return actions
     
     def _apply_action(
@@ -244,29 +357,17 @@ class ReinforcementLearningOptimizer:
         """Apply a parameter adjustment action."""
         new_params = params.copy()
         
-        # Threshold adjustments
-        if action == 'increase_threshold' and 'threshold' in new_params:
-            new_params['threshold'] = min(new_params['threshold'] * 1.1, 1.0)
-        elif action == 'decrease_threshold' and 'threshold' in new_params:
-            new_params['threshold'] = max(new_params['threshold'] * 0.9, 0.001)
-        
-        # Position size adjustments
-        elif action == 'increase_size' and 'position_size' in new_params:
-            new_params['position_size'] = min(new_params['position_size'] * 1.1, 1.0)
-        elif action == 'decrease_size' and 'position_size' in new_params:
-            new_params['position_size'] = max(new_params['position_size'] * 0.9, 0.01)
-        
-        # Stop loss adjustments
-        elif action == 'tighten_stop' and 'stop_loss' in new_params:
-            new_params['stop_loss'] = max(new_params['stop_loss'] * 0.9, 0.01)
-        elif action == 'loosen_stop' and 'stop_loss' in new_params:
-            new_params['stop_loss'] = min(new_params['stop_loss'] * 1.1, 0.2)
+        handler = _ACTION_HANDLERS.get(action)
+        if handler is not None:
+            param, adjust = handler
+            if param in new_params:
+                new_params[param] = adjust(new_params[param])
         
         return new_params
     
     def get_performance_metrics(self) -> Dict[str, Any]:
         """Get performance metrics of the RL optimizer."""
-        if not self.episode_rewards:
+        if not self._episode_count:
             return {
                 'total_episodes': 0,
                 'average_reward': 0,
@@ -275,10 +376,10 @@ class ReinforcementLearningOptimizer:
             }
         
         return {
-            'total_episodes': len(self.episode_rewards),
-            'average_reward': sum(self.episode_rewards) / len(self.episode_rewards),
-            'recent_average': sum(self.episode_rewards[-100:]) / min(100, len(self.episode_rewards)),
+            'total_episodes': self._episode_count,
+            'average_reward': self._reward_sum / self._episode_count,
+            'recent_average': self._reward_sum_recent / len(self._recent_rewards),
             'training_steps': self.training_steps,
             'exploration_rate': self.exploration_rate,
-            'q_table_size': len(self.q_table)
+            'q_table_size': len(self._state_ids)
         }
@@ -5,11 +5,14 @@ MEGA DeFi Profit Machine - Main Orchestrator
 The unstoppable profit machine that combines vision with technical expertise.
 """
 
+import asyncio
+import itertools
 import logging
-from typing import Dict, Any, Optional
+import threading
+from typing import Dict, Any, Iterable, Iterator, List, Optional
 from .core.strategy_engine import StrategyEngine, StrategyType, Signal
 from .core.market_analyzer import MarketAnalyzer
-from .core.risk_manager import RiskManager
+from .core.risk_manager import RiskManager, RiskLevel
 from .core.profit_optimizer import ProfitOptimizer
 from .config import Config
 
@@ -22,6 +25,12 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Enum lookups resolved once at import for the per-tick path
+_STRATEGY_BY_VALUE = {strategy_type.value: strategy_type for strategy_type in StrategyType}
+_HOLD = Signal.HOLD
+
+_BANNER_RULE = "=" * 60
+
 
 class ProfitMachine:
     """
@@ -49,10 +58,6 @@ class ProfitMachine:
             enable_ml: Enable ML components (optional, experimental)
             enable_data_sources: Enable data source integrations (optional, experimental)
         """
-        logger.info("=" * 60)
-        logger.info("INITIALIZING MEGA DEFI PROFIT MACHINE")
-        logger.info("=" * 60)
-        
         # Load configuration from environment variables if not provided
         if portfolio_value is None:
             portfolio_value = Config.get_initial_portfolio_value()
@@ -61,16 +66,17 @@ class ProfitMachine:
         if max_position_size is None:
             max_position_size = Config.get_max_position_size()
         
-        logger.info(f"Configuration loaded from environment")
-        logger.info(f"Environment: {Config.get_environment()}")
-        logger.info(f"Debug Mode: {Config.get_debug_mode()}")
-        logger.info(f"Dry Run: {Config.get_dry_run()}")
-        
         self.strategy_engine = StrategyEngine()
         self.market_analyzer = MarketAnalyzer()
         self.risk_manager = RiskManager(max_risk_per_trade, max_position_size)
         self.profit_optimizer = ProfitOptimizer()
         
+        # Serializes pipeline runs across threads, including the async API's workers
+        self._pipeline_lock = threading.Lock()
+        
+        # Integer position ids are cheap to create and hash
+        self._position_counter = itertools.count()
+        
         # Optional: Initialize intelligence layer
         self.intelligence_layer = None
         if enable_ml or enable_data_sources:
@@ -82,18 +88,24 @@ class ProfitMachine:
                 )
                 logger.info("🧠 Intelligence Layer activated (ML & Data Sources)")
             except ImportError as e:
-                logger.warning(f"Could not initialize intelligence layer: {e}")
+                logger.warning("Could not initialize intelligence layer: %s", e)
         
         self.risk_manager.update_portfolio(portfolio_value)
         
         # Register default strategies
         self._register_default_strategies()
         
-        logger.info(f"Portfolio Value: ${portfolio_value:,.2f}")
-        logger.info(f"Max Risk Per Trade: {max_risk_per_trade*100:.1f}%")
-        logger.info(f"Max Position Size: {max_position_size*100:.1f}%")
-        logger.info("Profit Machine Ready - UNSTOPPABLE MODE ACTIVATED")
-        logger.info("=" * 60)
+        # The whole banner goes out as one record, built only when INFO is enabled
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("%s\nINITIALIZING MEGA DEFI PROFIT MACHINE\n%s\n"
+                        "Configuration loaded from environment\n"
+                        "Environment: %s\nDebug Mode: %s\nDry Run: %s\n"
+                        "Portfolio Value: $%s\nMax Risk Per Trade: %.1f%%\nMax Position Size: %.1f%%\n"
+                        "Profit Machine Ready - UNSTOPPABLE MODE ACTIVATED\n%s",
+                        _BANNER_RULE, _BANNER_RULE,
+                        Config.get_environment(), Config.get_debug_mode(), Config.get_dry_run(),
+                        format(portfolio_value, ',.2f'), max_risk_per_trade * 100,
+                        max_position_size * 100, _BANNER_RULE)
     
     def _register_default_strategies(self):
         """Register all available trading strategies."""
@@ -105,8 +117,7 @@ class ProfitMachine:
             (StrategyType.LIQUIDITY_PROVISION, {'min_fee_rate': 0.003}),
         ]
         
-        for strategy_type, params in strategies:
-            self.strategy_engine.register_strategy(strategy_type, params)
+        self.strategy_engine.register_strategies(strategies)
     
     def process_market_data(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -120,50 +131,152 @@ class ProfitMachine:
         """
         logger.info("Processing market data...")
         
-        # Analyze market
-        analysis = self.market_analyzer.analyze_market(market_data)
-        logger.info(f"Market Analysis: Trend={analysis['trend']:.4f}, "
-                   f"Volatility={analysis['volatility']:.4f}, "
-                   f"Opportunities={len(analysis['opportunities'])}")
+        return self._process_tick(
+            market_data,
+            list(self.strategy_engine.active_strategies.keys()),
+            {'position_size': self.risk_manager.max_position_size}
+        )
+    
+    async def process_market_data_async(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Process market data without blocking the running event loop.
+        
+        The synchronous pipeline runs in the loop's default executor so that
+        asyncio-based feeds can keep awaiting I/O while a tick is processed.
+        Ticks from every entry point are serialized because market analysis
+        is stateful.
+        
+        Args:
+            market_data: Current market data (price, volume, liquidity, etc.)
+            
+        Returns:
+            Trading recommendation with strategy, signals, and risk assessment
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.process_market_data, market_data)
+    
+    def process_market_data_batch(self, market_data_batch: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Process a sequence of market data ticks in order.
         
-        # Get available strategies
+        Inputs that do not change within a batch (registered strategies, position
+        sizing context) are built once rather than per tick. Ticks are processed
+        sequentially because market analysis depends on prior price history.
+        
+        Args:
+            market_data_batch: Market data ticks, oldest first
+            
+        Returns:
+            One trading recommendation per tick
+        """
+        logger.info("Processing market data batch...")
+        return list(self.process_market_data_stream(market_data_batch))
+    
+    def process_market_data_stream(self, market_data_stream: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily process market data ticks, yielding each recommendation as it is ready.
+        
+        Suited to long backtests and live feeds where materializing every
+        recommendation up front is unnecessary.
+        
+        Args:
+            market_data_stream: Market data ticks, oldest first
+            
+        Yields:
+            Trading recommendation for each tick, in input order
+        """
         available_strategies = list(self.strategy_engine.active_strategies.keys())
+        sizing_context = {'position_size': self.risk_manager.max_position_size}
+        
+        for market_data in market_data_stream:
+            yield self._process_tick(market_data, available_strategies, sizing_context)
+    
+    def _process_tick(self,
+                      market_data: Dict[str, Any],
+                      available_strategies: List[str],
+                      sizing_context: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one tick through analysis, optimization, strategy and risk checks."""
+        with self._pipeline_lock:
+            return self._run_tick(market_data, available_strategies, sizing_context)
+    
+    def _run_tick(self,
+                  market_data: Dict[str, Any],
+                  available_strategies: List[str],
+                  sizing_context: Dict[str, Any]) -> Dict[str, Any]:
+        """Pipeline body of _process_tick; callers must hold the pipeline lock."""
+        # Analyze market
+        analysis = self.market_analyzer.analyze_market(market_data)
+        logger.info("Market Analysis: Trend=%.4f, Volatility=%.4f, Opportunities=%d",
+                    analysis['trend'], analysis['volatility'], len(analysis['opportunities']))
+        
+        # Skip the rest of the pipeline when risk limits would reject any trade.
+        # Analysis still runs so price history stays continuous.
+        if not self.risk_manager.has_capacity():
+            logger.info("✗ Trade not approved: no capacity")
+            # Same shape as a normal recommendation. No strategy was chosen,
+            # and a saturated book is reported as high risk.
+            return {
+                'signal': _HOLD.value,
+                'strategy': None,
+                'confidence': 0.0,
+                'expected_profit': 0.0,
+                'risk_assessment': {
+                    'risk_level': RiskLevel.HIGH,
+                    'position_size': 0.0,
+                    'stop_loss': 0.0,
+                    'take_profit': 0.0,
+                    'max_loss': 0.0,
+                    'risk_reward_ratio': 0,
+                    'approved': False,
+                    'reason': 'no_capacity'
+                },
+                'market_analysis': analysis,
+                'optimization': {},
+                'approved': False
+            }
         
         # Optimize execution
         optimization = self.profit_optimizer.optimize_execution(
             analysis,
             available_strategies,
-            {'position_size': self.risk_manager.max_position_size}
+            sizing_context
         )
         
+        # Bind the fields read more than once
+        confidence = optimization['confidence']
+        expected_profit = optimization['expected_profit']
+        
         # Get recommended strategy
-        strategy_type = StrategyType(optimization['recommended_strategy'])
+        strategy_type = _STRATEGY_BY_VALUE[optimization['recommended_strategy']]
+        strategy_name = strategy_type.value
         
         # Execute strategy
         signal = self.strategy_engine.execute_strategy(strategy_type, analysis)
+        signal_name = signal.value
         
         # Assess risk
-        risk_assessment = self.risk_manager.assess_risk(analysis, strategy_type.value)
+        risk_assessment = self.risk_manager.assess_risk(analysis, strategy_name)
+        approved = risk_assessment['approved'] and signal is not _HOLD
         
         # Compile recommendation
         recommendation = {
-            'signal': signal.value,
-            'strategy': strategy_type.value,
-            'confidence': optimization['confidence'],
-            'expected_profit': optimization['expected_profit'],
+            'signal': signal_name,
+            'strategy': strategy_name,
+            'confidence': confidence,
+            'expected_profit': expected_profit,
             'risk_assessment': risk_assessment,
             'market_analysis': analysis,
             'optimization': optimization,
-            'approved': risk_assessment['approved'] and signal != Signal.HOLD
+            'approved': approved
         }
         
-        if recommendation['approved']:
-            logger.info(f"✓ TRADE APPROVED: {signal.value.upper()} via {strategy_type.value}")
-            logger.info(f"  Expected Profit: {optimization['expected_profit']:.2%}")
-            logger.info(f"  Confidence: {optimization['confidence']:.2%}")
-            logger.info(f"  Risk/Reward: {risk_assessment['risk_reward_ratio']:.2f}")
+        if approved:
+            logger.info("✓ TRADE APPROVED: %s via %s", signal_name.upper(), strategy_name)
+            logger.info("  Expected Profit: %.2f%%", expected_profit * 100)
+            logger.info("  Confidence: %.2f%%", confidence * 100)
+            logger.info("  Risk/Reward: %.2f", risk_assessment['risk_reward_ratio'])
         else:
-            logger.info(f"✗ Trade not approved: {signal.value}")
+            logger.info("✗ Trade not approved: %s", signal_name)
         
         return recommendation
     
@@ -189,20 +302,22 @@ class ProfitMachine:
         
         # Simulate trade execution
         position_size = risk_assessment['position_size']
+        stop_loss = risk_assessment['stop_loss']
+        take_profit = risk_assessment['take_profit']
         entry_price = recommendation['optimization']['entry_price']
         
-        position_id = f"{strategy}_{signal}_{entry_price}"
+        position_id = next(self._position_counter)
         
         self.risk_manager.open_position(position_id, {
             'strategy': strategy,
             'signal': signal,
             'size': position_size,
             'entry_price': entry_price,
-            'stop_loss': risk_assessment['stop_loss'],
-            'take_profit': risk_assessment['take_profit']
+            'stop_loss': stop_loss,
+            'take_profit': take_profit
         })
         
-        logger.info(f"Trade Executed: {signal.upper()} {position_size:.2%} of portfolio")
+        logger.info("Trade Executed: %s %.2f%% of portfolio", signal.upper(), position_size * 100)
         
         return {
             'executed': True,
@@ -211,12 +326,12 @@ class ProfitMachine:
             'signal': signal,
             'position_size': position_size,
             'entry_price': entry_price,
-            'stop_loss': risk_assessment['stop_loss'],
-            'take_profit': risk_assessment['take_profit']
+            'stop_loss': stop_loss,
+            'take_profit': take_profit
         }
     
     def close_trade(self, 
-                   position_id: str,
+                   position_id: int,
                    exit_price: float,
                    profit: float,
                    success: bool):
@@ -239,7 +354,7 @@ class ProfitMachine:
             # Close position
             self.risk_manager.close_position(position_id)
             
-            logger.info(f"Trade Closed: Profit={profit:.4f} ({'WIN' if success else 'LOSS'})")
+            logger.info("Trade Closed: Profit=%.4f (%s)", profit, 'WIN' if success else 'LOSS')
     
     def get_performance_report(self) -> Dict[str, Any]:
         """Get comprehensive performance report."""
@@ -253,39 +368,52 @@ class ProfitMachine:
         """Display performance report in readable format."""
         report = self.get_performance_report()
         
-        print("\n" + "=" * 60)
-        print("MEGA DEFI PROFIT MACHINE - PERFORMANCE REPORT")
-        print("=" * 60)
+        # The report is assembled line by line and written with a single print
+        lines = [
+            "\n" + "=" * 60,
+            "MEGA DEFI PROFIT MACHINE - PERFORMANCE REPORT",
+            "=" * 60,
+        ]
         
         # Portfolio Status
         portfolio = report['portfolio_status']
-        print("\n📊 PORTFOLIO STATUS:")
-        print(f"  Value: ${portfolio['portfolio_value']:,.2f}")
-        print(f"  Active Positions: {portfolio['active_positions']}")
-        print(f"  Total Exposure: {portfolio['total_exposure']:.2%}")
-        print(f"  Available Capacity: {portfolio['available_capacity']:.2%}")
+        lines.extend((
+            "\n📊 PORTFOLIO STATUS:",
+            f"  Value: ${portfolio['portfolio_value']:,.2f}",
+            f"  Active Positions: {portfolio['active_positions']}",
+            f"  Total Exposure: {portfolio['total_exposure']:.2%}",
+            f"  Available Capacity: {portfolio['available_capacity']:.2%}",
+        ))
         
         # Profit Report
         profit = report['profit_report']
-        print("\n💰 PROFIT REPORT:")
-        print(f"  Total Profit: ${profit['total_profit']:,.2f}")
-        print(f"  Total Trades: {profit['total_trades']}")
-        print(f"  Average Profit/Trade: ${profit['average_profit_per_trade']:,.4f}")
-        print(f"  Overall Win Rate: {profit['overall_win_rate']:.2%}")
+        lines.extend((
+            "\n💰 PROFIT REPORT:",
+            f"  Total Profit: ${profit['total_profit']:,.2f}",
+            f"  Total Trades: {profit['total_trades']}",
+            f"  Average Profit/Trade: ${profit['average_profit_per_trade']:,.4f}",
+            f"  Overall Win Rate: {profit['overall_win_rate']:.2%}",
+        ))
         if profit['best_strategy']:
-            print(f"  Best Strategy: {profit['best_strategy']}")
+            lines.append(f"  Best Strategy: {profit['best_strategy']}")
         
         # Market Summary
         market = report['market_summary']
         if 'current_price' in market:
-            print("\n📈 MARKET SUMMARY:")
-            print(f"  Current Price: ${market['current_price']:,.2f}")
-            print(f"  24h Change: {market['price_change_24h']:.2f}%")
-            print(f"  Data Points: {market['data_points']}")
-        
-        print("\n" + "=" * 60)
-        print("STATUS: UNSTOPPABLE ✓")
-        print("=" * 60 + "\n")
+            lines.extend((
+                "\n📈 MARKET SUMMARY:",
+                f"  Current Price: ${market['current_price']:,.2f}",
+                f"  24h Change: {market['price_change_24h']:.2f}%",
+                f"  Data Points: {market['data_points']}",
+            ))
+        
+        lines.extend((
+            "\n" + "=" * 60,
+            "STATUS: UNSTOPPABLE ✓",
+            "=" * 60 + "\n",
+        ))
+        
+        print("\n".join(lines))
 
 
 def create_profit_machine(**kwargs) -> ProfitMachine:
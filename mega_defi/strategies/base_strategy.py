@@ -6,10 +6,16 @@ Provides the foundation for all production-ready trading strategies with
 global ranking capabilities for elite production operations.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Awaitable, Callable, Hashable, List, Optional
 from enum import Enum
 from abc import ABC, abstractmethod
+from bisect import bisect_right
+from collections import OrderedDict
+from operator import itemgetter
+import asyncio
+import heapq
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +29,146 @@ class StrategyRank(Enum):
     EXPERIMENTAL = "experimental"  # Testing phase
 
 
+# Score thresholds and the tier reached at or above each one
+_RANK_THRESHOLDS = (60, 75, 90)
+_RANK_TIERS = (
+    StrategyRank.STANDARD,
+    StrategyRank.PROFESSIONAL,
+    StrategyRank.ADVANCED,
+    StrategyRank.ELITE,
+)
+
+# Minimum trades before a strategy receives a non-zero rank score
+_MIN_RANKED_TRADES = 5
+
+
+def _rank_score(win_rate: float,
+                profit_factor: float,
+                risk_adjusted_return: float,
+                total_trades: int) -> float:
+    """
+    Weighted composite ranking score on a 0-100 scale.
+    
+    Each component is normalized to 0-100 and capped before weighting:
+    win rate (30%), profit factor (30%), risk-adjusted return (25%)
+    and trade count as a consistency measure (15%).
+    """
+    win_rate_score = win_rate * 100.0
+    if win_rate_score > 100.0:
+        win_rate_score = 100.0
+    profit_factor_score = profit_factor / 3.0 * 100.0
+    if profit_factor_score > 100.0:
+        profit_factor_score = 100.0
+    risk_adjusted_score = risk_adjusted_return * 10.0
+    if risk_adjusted_score > 100.0:
+        risk_adjusted_score = 100.0
+    consistency_score = total_trades if total_trades < 100 else 100.0
+    
+    return (
+        win_rate_score * 0.30 +
+        profit_factor_score * 0.30 +
+        risk_adjusted_score * 0.25 +
+        consistency_score * 0.15
+    )
+
+
+def _rank_tier(score: float) -> StrategyRank:
+    """Map a global rank score to its tier."""
+    return _RANK_TIERS[bisect_right(_RANK_THRESHOLDS, score)]
+
+
+class _AnalysisCache:
+    """Small LRU cache for analysis results keyed by a market snapshot."""
+    
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+    
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for key, or None on a miss."""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+    
+    def put(self, key: Hashable, value: Any):
+        """Store value under key, evicting the least recently used entry."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop every cached entry."""
+        self._entries.clear()
+
+
+class _TopRows:
+    """
+    Collect scored rows (score first), keeping only the best ``limit`` when capped.
+    
+    Capped collection holds a bounded heap instead of every survivor, and
+    ranks rows exactly like ``heapq.nlargest``: earlier rows win score ties.
+    """
+    
+    __slots__ = ('limit', 'count', '_rows')
+    
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.count = 0
+        self._rows: List[tuple] = []
+    
+    def add(self, row: tuple):
+        """Record one survivor row."""
+        self.count += 1
+        limit = self.limit
+        rows = self._rows
+        if limit is None:
+            rows.append(row)
+        elif len(rows) < limit:
+            heapq.heappush(rows, (row[0], -self.count, row))
+        elif limit > 0 and row[0] > rows[0][0]:
+            heapq.heapreplace(rows, (row[0], -self.count, row))
+    
+    def best(self) -> tuple:
+        """Return the kept rows ordered by descending score."""
+        if self.limit is None:
+            self._rows.sort(key=itemgetter(0), reverse=True)
+            return tuple(self._rows)
+        return tuple(entry[2] for entry in sorted(self._rows, reverse=True))
+
+
+async def _gather_sources(
+        sources: Dict[str, Callable[[], Awaitable[Dict[str, Any]]]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Await every market data source concurrently.
+    
+    Each source is a zero-argument coroutine function, typically wrapping a
+    caller-owned HTTP or JSON-RPC client, so total latency is that of the
+    slowest source rather than the sum. Sources that raise an Exception are
+    logged and left out of the result; cancellation still propagates.
+    
+    Args:
+        sources: Coroutine functions keyed by source name
+        
+    Returns:
+        Fetched data keyed by source name
+    """
+    names = list(sources)
+    results = await asyncio.gather(*(sources[name]() for name in names), return_exceptions=True)
+    
+    gathered = {}
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            logger.warning("Market data source %s failed: %s", name, result)
+            continue
+        if isinstance(result, BaseException):
+            raise result
+        gathered[name] = result
+    
+    return gathered
+
+
 class BaseStrategy(ABC):
     """
     Base class for all production-ready trading strategies.
@@ -32,8 +178,22 @@ class BaseStrategy(ABC):
     - generate_signal(): Generate trading signals
     - calculate_position_size(): Position sizing logic
     - get_performance_metrics(): Return performance data
+    
+    Core metrics live in fixed slots. Subclasses without their own __slots__
+    still get a __dict__ for strategy-specific configuration; declare
+    __slots__ listing those attributes to drop the per-instance dict entirely.
     """
     
+    __slots__ = (
+        'name', 'description', 'rank', 'enabled',
+        'total_trades', 'winning_trades', 'total_profit', 'total_loss',
+        'sharpe_ratio', 'max_drawdown',
+        'global_rank_score', 'profit_factor', 'win_rate', 'average_profit',
+        'risk_adjusted_return',
+        '_return_mean', '_return_m2', '_equity', '_equity_peak',
+        '_ready_cache', '_metrics_cache', '_state_version', '_lock',
+    )
+    
     def __init__(self, name: str, description: str):
         """
         Initialize base strategy.
@@ -62,7 +222,25 @@ class BaseStrategy(ABC):
         self.average_profit = 0.0
         self.risk_adjusted_return = 0.0
         
-        logger.info(f"Strategy initialized: {self.name}")
+        # Running per-trade return moments and equity curve for O(1) updates
+        self._return_mean = 0.0
+        self._return_m2 = 0.0
+        self._equity = 0.0
+        self._equity_peak = 0.0
+        
+        # Memoized production-readiness metric check, reset when metrics change
+        self._ready_cache: Optional[bool] = None
+        
+        # Memoized performance metrics dict, reset when metrics change
+        self._metrics_cache: Optional[Dict[str, Any]] = None
+        
+        # Bumped whenever ranking inputs change so registries can skip re-ranking
+        self._state_version = 0
+        
+        # Guards trade accumulators so threads can record concurrently
+        self._lock = threading.Lock()
+        
+        logger.info("Strategy initialized: %s", self.name)
     
     @abstractmethod
     def analyze(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -112,22 +290,73 @@ class BaseStrategy(ABC):
         """
         Record trade result and update metrics.
         
+        Callers that already know the outcome can call record_win() or
+        record_loss() directly and skip the dispatch.
+        
         Args:
             profit: Profit/loss from trade
             success: Whether trade was successful
         """
-        self.total_trades += 1
-        
         if success:
+            self.record_win(profit)
+        else:
+            self.record_loss(abs(profit))
+    
+    def record_win(self, profit: float):
+        """
+        Record a successful trade and update metrics.
+        
+        Args:
+            profit: Profit from the trade
+        """
+        with self._lock:
+            self.total_trades += 1
             self.winning_trades += 1
             self.total_profit += profit
-        else:
-            self.total_loss += abs(profit)
+            self._after_trade(profit)
         
-        # Update metrics
+        logger.info("%s - Trade recorded: Profit=%.4f, Success=True", self.name, profit)
+    
+    def record_loss(self, loss: float):
+        """
+        Record an unsuccessful trade and update metrics.
+        
+        Args:
+            loss: Size of the loss as a non-negative amount
+        """
+        with self._lock:
+            self.total_trades += 1
+            self.total_loss += loss
+            self._after_trade(-loss)
+        
+        logger.info("%s - Trade recorded: Profit=%.4f, Success=False", self.name, -loss)
+    
+    def _after_trade(self, trade_return: float):
+        """Refresh derived metrics and drop memoized results after a trade."""
+        self._update_risk_metrics(trade_return)
         self._update_metrics()
+        self._ready_cache = None
+        self._metrics_cache = None
+        self._state_version += 1
+    
+    def _update_risk_metrics(self, trade_return: float):
+        """Fold one trade return into the running Sharpe and drawdown."""
+        n = self.total_trades
+        delta = trade_return - self._return_mean
+        self._return_mean += delta / n
+        self._return_m2 += delta * (trade_return - self._return_mean)
         
-        logger.info(f"{self.name} - Trade recorded: Profit={profit:.4f}, Success={success}")
+        if n > 1 and self._return_m2 > 0:
+            self.sharpe_ratio = self._return_mean / (self._return_m2 / (n - 1)) ** 0.5
+        else:
+            self.sharpe_ratio = 0.0
+        
+        self._equity += trade_return
+        if self._equity > self._equity_peak:
+            self._equity_peak = self._equity
+        drawdown = self._equity_peak - self._equity
+        if drawdown > self.max_drawdown:
+            self.max_drawdown = drawdown
     
     def _update_metrics(self):
         """Update strategy performance metrics."""
@@ -159,58 +388,73 @@ class BaseStrategy(ABC):
         - Risk-adjusted return (25%)
         - Total trades (consistency) (15%)
         """
-        if self.total_trades < 5:
+        if self.total_trades < _MIN_RANKED_TRADES:
             self.global_rank_score = 0
             return
         
-        # Normalize components (0-100 scale)
-        win_rate_score = min(self.win_rate * 100, 100)
-        profit_factor_score = min((self.profit_factor / 3.0) * 100, 100)
-        risk_adjusted_score = min(self.risk_adjusted_return * 10, 100)
-        consistency_score = min((self.total_trades / 100) * 100, 100)
-        
-        # Weighted average
-        self.global_rank_score = (
-            win_rate_score * 0.30 +
-            profit_factor_score * 0.30 +
-            risk_adjusted_score * 0.25 +
-            consistency_score * 0.15
+        self.global_rank_score = _rank_score(
+            self.win_rate,
+            self.profit_factor,
+            self.risk_adjusted_return,
+            self.total_trades
         )
+        self.rank = _rank_tier(self.global_rank_score)
+    
+    @classmethod
+    def rank_all(cls, strategies: List['BaseStrategy']) -> List[float]:
+        """
+        Recompute global rank scores and tiers for many strategies in one pass.
         
-        # Update rank tier
-        if self.global_rank_score >= 90:
-            self.rank = StrategyRank.ELITE
-        elif self.global_rank_score >= 75:
-            self.rank = StrategyRank.ADVANCED
-        elif self.global_rank_score >= 60:
-            self.rank = StrategyRank.PROFESSIONAL
-        else:
-            self.rank = StrategyRank.STANDARD
+        Args:
+            strategies: Strategies to rank
+            
+        Returns:
+            Global rank score of each strategy, in input order
+        """
+        scores = []
+        for strategy in strategies:
+            with strategy._lock:
+                strategy._calculate_global_rank_score()
+                strategy._ready_cache = None
+                strategy._metrics_cache = None
+                strategy._state_version += 1
+            scores.append(strategy.global_rank_score)
+        
+        return scores
     
     def get_performance_metrics(self) -> Dict[str, Any]:
         """
         Get comprehensive performance metrics.
         
+        The metrics are built once per change and cached; each call returns a
+        fresh copy so subclasses and callers may extend it freely.
+        
         Returns:
             Dictionary with all performance data
         """
-        return {
-            'name': self.name,
-            'description': self.description,
-            'rank': self.rank.value,
-            'global_rank_score': self.global_rank_score,
-            'enabled': self.enabled,
-            'total_trades': self.total_trades,
-            'winning_trades': self.winning_trades,
-            'win_rate': self.win_rate,
-            'total_profit': self.total_profit,
-            'total_loss': self.total_loss,
-            'average_profit': self.average_profit,
-            'profit_factor': self.profit_factor,
-            'risk_adjusted_return': self.risk_adjusted_return,
-            'sharpe_ratio': self.sharpe_ratio,
-            'max_drawdown': self.max_drawdown,
-        }
+        with self._lock:
+            if self._metrics_cache is None:
+                self._metrics_cache = {
+                    'name': self.name,
+                    'description': self.description,
+                    'rank': self.rank.value,
+                    'global_rank_score': self.global_rank_score,
+                    'enabled': self.enabled,
+                    'total_trades': self.total_trades,
+                    'winning_trades': self.winning_trades,
+                    'win_rate': self.win_rate,
+                    'total_profit': self.total_profit,
+                    'total_loss': self.total_loss,
+                    'average_profit': self.average_profit,
+                    'profit_factor': self.profit_factor,
+                    'risk_adjusted_return': self.risk_adjusted_return,
+                    'sharpe_ratio': self.sharpe_ratio,
+                    'max_drawdown': self.max_drawdown,
+                }
+        
+            metrics = self._metrics_cache.copy()
+        metrics['enabled'] = self.enabled
+        return metrics
     
     def get_global_ranking(self) -> Dict[str, Any]:
         """
@@ -236,13 +480,32 @@ class BaseStrategy(ABC):
         Returns:
             True if strategy meets production criteria
         """
-        return (
-            self.enabled and
-            self.total_trades >= 10 and
-            self.win_rate >= 0.5 and
-            self.profit_factor >= 1.5 and
-            self.global_rank_score >= 60
-        )
+        if self._ready_cache is None:
+            self._ready_cache = (
+                self.total_trades >= 10 and
+                self.win_rate >= 0.5 and
+                self.profit_factor >= 1.5 and
+                self.global_rank_score >= 60
+            )
+        
+        # enabled is toggled externally, so it is never cached
+        return self.enabled and self._ready_cache
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle/copy state: every slot and instance attribute except the lock."""
+        state = dict(getattr(self, '__dict__', {}))
+        for cls in type(self).__mro__:
+            slots = cls.__dict__.get('__slots__', ())
+            for name in ((slots,) if isinstance(slots, str) else slots):
+                if name != '_lock' and not name.startswith('__') and hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]):
+        """Restore pickled state with a fresh lock."""
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        self._lock = threading.Lock()
     
     def __repr__(self):
         return f"<{self.name} (Rank: {self.rank.value}, Score: {self.global_rank_score:.2f})>"
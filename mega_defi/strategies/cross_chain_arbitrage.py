@@ -6,14 +6,53 @@ Advanced strategy for exploiting price differences across blockchain networks.
 Targets 3-15% profit per trade with cross-chain bridge opportunities.
 """
 
-from typing import Dict, Any, List
-from .base_strategy import BaseStrategy
+from operator import itemgetter
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
+from .base_strategy import BaseStrategy, _AnalysisCache, _TopRows, _gather_sources
 from ..config import Config
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _opportunity_score(net_profit: float,
+                       liquidity: float,
+                       bridge_time: int,
+                       bridge_fee: float) -> float:
+    """Weighted cross-chain opportunity score (higher is better)."""
+    # Profit component (weight: 50%)
+    profit_score = net_profit * 100
+    
+    # Liquidity component (weight: 25%)
+    liquidity_score = liquidity * 2e-5  # liquidity / 50000
+    liquidity_score = 10.0 if 10.0 < liquidity_score else liquidity_score
+    
+    # Speed component (weight: 15%)
+    speed_score = 10 - (bridge_time / 60)
+    speed_score = 0 if 0 > speed_score else speed_score
+    
+    # Fee efficiency component (weight: 10%)
+    fee_score = 10 - (bridge_fee * 500)
+    fee_score = 0 if 0 > fee_score else fee_score
+    
+    # Weighted score
+    score = (
+        profit_score * 0.50 +
+        liquidity_score * 0.25 +
+        speed_score * 0.15 +
+        fee_score * 0.10
+    )
+    
+    return score
+
+
+# Opportunity dict keys, in the order they are stored in analyze()'s survivor rows
+_OPPORTUNITY_FIELDS = (
+    'buy_chain', 'sell_chain', 'buy_price', 'sell_price', 'gross_profit',
+    'net_profit', 'bridge_fee', 'bridge_time', 'liquidity',
+)
+
+
 class CrossChainArbitrageStrategy(BaseStrategy):
     """
     Cross-chain arbitrage strategy for multi-chain opportunities.
@@ -25,6 +64,9 @@ class CrossChainArbitrageStrategy(BaseStrategy):
     - Optimizes for maximum profit after all costs
     """
     
+    # Chains bridged on the faster layer-2 schedule
+    _L2_CHAINS = frozenset({'Arbitrum', 'Optimism', 'Polygon'})
+    
     def __init__(self,
                  min_profit_after_fees: float = None,
                  max_bridge_time: int = None,
@@ -51,14 +93,14 @@ class CrossChainArbitrageStrategy(BaseStrategy):
             max_bridge_time if max_bridge_time is not None 
             else Config.get_cross_chain_max_bridge_time()
         )
-        self.supported_chains = supported_chains or [
-            'Ethereum', 'BSC', 'Polygon', 'Arbitrum', 'Optimism', 'Avalanche'
-        ]
         
         logger.info(f"Cross-Chain Arbitrage initialized with config: "
                    f"min_profit={self.min_profit_after_fees*100:.2f}%, "
                    f"max_bridge_time={self.max_bridge_time}s")
         
+        # Recent pair-scan results keyed by the extracted market snapshot
+        self._analysis_cache = _AnalysisCache()
+        
         # Bridge fee estimates (percentage)
         self.bridge_fees = {
             ('Ethereum', 'BSC'): 0.001,
@@ -69,15 +111,54 @@ class CrossChainArbitrageStrategy(BaseStrategy):
             ('BSC', 'Avalanche'): 0.002,
         }
         
+        self.supported_chains = supported_chains or [
+            'Ethereum', 'BSC', 'Polygon', 'Arbitrum', 'Optimism', 'Avalanche'
+        ]
+        
+        # Chains and fees the bridge tables were last built from
+        self._bridge_snapshot: Optional[tuple] = None
+        self._refresh_bridge_tables()
+        
         self.cross_chain_opportunities = 0
         self.successful_bridges = 0
     
-    def analyze(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _refresh_bridge_tables(self):
+        """Rebuild the chain index and fee/time tables if the chains or fees changed."""
+        snapshot = (tuple(self.supported_chains), tuple(self.bridge_fees.items()))
+        if snapshot == self._bridge_snapshot:
+            return
+        
+        self._bridge_snapshot = snapshot
+        chains = snapshot[0]
+        
+        # Chain -> position map, also used as the O(1) supported-chain check
+        self._chain_idx = {chain: i for i, chain in enumerate(chains)}
+        
+        # Indexed by chain position in supported_chains
+        self._fee_mat = [[self._get_bridge_fee(a, b) for b in chains] for a in chains]
+        self._time_mat = [[self._estimate_bridge_time(a, b) for b in chains] for a in chains]
+        
+        self._analysis_cache.clear()
+    
+    @property
+    def max_bridge_time(self) -> int:
+        """Maximum acceptable bridge time in seconds."""
+        return self._max_bridge_time
+    
+    @max_bridge_time.setter
+    def max_bridge_time(self, value: int):
+        self._max_bridge_time = value
+        # Position sizing scales by bridge_time / max_bridge_time * 0.5;
+        # a zero limit applies no time discount
+        self._half_inv_max_bridge_time = 0.5 / value if value else 0.0
+    
+    def analyze(self, market_data: Dict[str, Any], top_k: Optional[int] = None) -> Dict[str, Any]:
         """
         Analyze cross-chain arbitrage opportunities.
         
         Args:
             market_data: Market data with multi-chain prices
+            top_k: Return only the best top_k opportunities (default: all)
             
         Returns:
             Analysis with cross-chain opportunities
@@ -87,98 +168,131 @@ class CrossChainArbitrageStrategy(BaseStrategy):
         if len(chains_data) < 2:
             return {'opportunities': [], 'best_opportunity': None}
         
-        opportunities = []
+        # Pick up any edits to supported_chains or bridge_fees
+        self._refresh_bridge_tables()
+        
+        # Pull each usable chain's fields once instead of once per pair
+        chain_idx = self._chain_idx
+        chains = []
+        for position, (chain, data) in enumerate(chains_data.items()):
+            idx = chain_idx.get(chain)
+            if idx is None:
+                continue
+            price = data.get('price', 0)
+            if price <= 0:
+                continue
+            chains.append((price, -position, chain, idx, data.get('liquidity', 0)))
+        
+        # Order by price so the earlier chain of every pair is the buy side.
+        # Equal prices keep the original tie-break (buy on the later input).
+        chains.sort(key=itemgetter(0, 1))
+        
+        # Repeated snapshots reuse the pair scan; only the result dicts are rebuilt
+        key = (tuple(chains), top_k, self.min_profit_after_fees, self.max_bridge_time)
+        scan = self._analysis_cache.get(key)
+        if scan is None:
+            scan = self._scan_pairs(chains, top_k)
+            self._analysis_cache.put(key, scan)
+        best_rows, total = scan
+        
+        opportunities = [
+            dict(zip(_OPPORTUNITY_FIELDS, row[1:]), opportunity_score=row[0])
+            for row in best_rows
+        ]
         
-        # Compare prices across all chain pairs
-        chain_names = list(chains_data.keys())
+        self.cross_chain_opportunities += total
         
-        for i in range(len(chain_names)):
-            for j in range(i + 1, len(chain_names)):
-                chain_a = chain_names[i]
-                chain_b = chain_names[j]
-                
-                if chain_a not in self.supported_chains or chain_b not in self.supported_chains:
-                    continue
-                
-                data_a = chains_data[chain_a]
-                data_b = chains_data[chain_b]
-                
-                price_a = data_a.get('price', 0)
-                price_b = data_b.get('price', 0)
-                liquidity_a = data_a.get('liquidity', 0)
-                liquidity_b = data_b.get('liquidity', 0)
-                
-                if price_a <= 0 or price_b <= 0:
-                    continue
-                
-                # Determine trade direction
-                if price_a < price_b:
-                    buy_chain = chain_a
-                    sell_chain = chain_b
-                    buy_price = price_a
-                    sell_price = price_b
-                else:
-                    buy_chain = chain_b
-                    sell_chain = chain_a
-                    buy_price = price_b
-                    sell_price = price_a
+        return {
+            'opportunities': opportunities,
+            'best_opportunity': opportunities[0] if opportunities else None,
+            'total_opportunities': total,
+        }
+    
+    def _scan_pairs(self, chains: List[tuple], top_k: Optional[int]) -> Tuple[tuple, int]:
+        """Score every profitable chain pair; return the best rows and survivor count."""
+        prices = [chain[0] for chain in chains]
+        names = [chain[2] for chain in chains]
+        indices = [chain[3] for chain in chains]
+        liquidities = [chain[4] for chain in chains]
+        fee_mat = self._fee_mat
+        time_mat = self._time_mat
+        min_profit = self.min_profit_after_fees
+        max_bridge_time = self.max_bridge_time
+        
+        rows = _TopRows(top_k)
+        
+        # Compare prices across all chain pairs
+        count = len(names)
+        for i in range(count):
+            buy_chain = names[i]
+            buy_price = prices[i]
+            liquidity_a = liquidities[i]
+            fee_row = fee_mat[indices[i]]
+            time_row = time_mat[indices[i]]
+            
+            for j in range(i + 1, count):
+                sell_chain = names[j]
+                sell_price = prices[j]
+                liquidity_b = liquidities[j]
+                chain_index = indices[j]
                 
                 # Calculate gross profit
                 gross_profit_pct = (sell_price - buy_price) / buy_price
                 
-                # Get bridge fee
-                bridge_fee = self._get_bridge_fee(buy_chain, sell_chain)
+                # Get bridge fee (tables are symmetric in the chain pair)
+                bridge_fee = fee_row[chain_index]
                 
                 # Calculate net profit after fees
                 net_profit_pct = gross_profit_pct - bridge_fee - 0.006  # 0.3% DEX fees each side
                 
                 # Estimate bridge time
-                bridge_time = self._estimate_bridge_time(buy_chain, sell_chain)
+                bridge_time = time_row[chain_index]
                 
                 # Check if opportunity is profitable
-                if (net_profit_pct >= self.min_profit_after_fees and
-                    bridge_time <= self.max_bridge_time):
-                    
-                    opportunity_score = self._calculate_opportunity_score(
+                if net_profit_pct >= min_profit and bridge_time <= max_bridge_time:
+                    liquidity = liquidity_b if liquidity_b < liquidity_a else liquidity_a
+                    opportunity_score = _opportunity_score(
                         net_profit_pct,
-                        min(liquidity_a, liquidity_b),
+                        liquidity,
                         bridge_time,
                         bridge_fee
                     )
                     
-                    opportunities.append({
-                        'buy_chain': buy_chain,
-                        'sell_chain': sell_chain,
-                        'buy_price': buy_price,
-                        'sell_price': sell_price,
-                        'gross_profit': gross_profit_pct,
-                        'net_profit': net_profit_pct,
-                        'bridge_fee': bridge_fee,
-                        'bridge_time': bridge_time,
-                        'liquidity': min(liquidity_a, liquidity_b),
-                        'opportunity_score': opportunity_score,
-                    })
-        
-        # Sort by opportunity score
-        opportunities.sort(key=lambda x: x['opportunity_score'], reverse=True)
-        
-        self.cross_chain_opportunities += len(opportunities)
+                    # Keep survivors as flat tuples; dicts are built after sorting
+                    rows.add((
+                        opportunity_score, buy_chain, sell_chain, buy_price, sell_price,
+                        gross_profit_pct, net_profit_pct, bridge_fee, bridge_time, liquidity,
+                    ))
+        
+        # Sorted by opportunity score; a capped scan only ever holds top_k rows
+        return rows.best(), rows.count
+    
+    async def gather_chain_data(
+            self,
+            sources: Dict[str, Callable[[], Awaitable[Dict[str, Any]]]]) -> Dict[str, Any]:
+        """
+        Fetch per-chain price data concurrently and shape it for analyze().
         
-        return {
-            'opportunities': opportunities,
-            'best_opportunity': opportunities[0] if opportunities else None,
-            'total_opportunities': len(opportunities),
-        }
+        Args:
+            sources: Coroutine functions keyed by chain name, each returning
+                a dict with at least 'price' and 'liquidity'
+            
+        Returns:
+            Market data with a 'chains' mapping; failed chains are omitted
+        """
+        return {'chains': await _gather_sources(sources)}
     
     def _get_bridge_fee(self, chain_a: str, chain_b: str) -> float:
         """Get bridge fee between two chains."""
         key = (chain_a, chain_b)
         reverse_key = (chain_b, chain_a)
         
-        if key in self.bridge_fees:
-            return self.bridge_fees[key]
-        elif reverse_key in self.bridge_fees:
-            return self.bridge_fees[reverse_key]
+        bridge_fees = self.bridge_fees
+        
+        if key in bridge_fees:
+            return bridge_fees[key]
+        elif reverse_key in bridge_fees:
+            return bridge_fees[reverse_key]
         else:
             return 0.002  # Default 0.2% bridge fee
     
@@ -194,7 +308,7 @@ class CrossChainArbitrageStrategy(BaseStrategy):
             Estimated time in seconds
         """
         # Layer 2s are faster
-        l2_chains = {'Arbitrum', 'Optimism', 'Polygon'}
+        l2_chains = self._L2_CHAINS
         
         if chain_a in l2_chains and chain_b in l2_chains:
             return 180  # 3 minutes for L2 to L2
@@ -220,27 +334,7 @@ class CrossChainArbitrageStrategy(BaseStrategy):
         Returns:
             Opportunity score (higher is better)
         """
-        # Profit component (weight: 50%)
-        profit_score = net_profit * 100
-        
-        # Liquidity component (weight: 25%)
-        liquidity_score = min(liquidity / 50000, 10.0)
-        
-        # Speed component (weight: 15%)
-        speed_score = max(10 - (bridge_time / 60), 0)
-        
-        # Fee efficiency component (weight: 10%)
-        fee_score = max(10 - (bridge_fee * 500), 0)
-        
-        # Weighted score
-        score = (
-            profit_score * 0.50 +
-            liquidity_score * 0.25 +
-            speed_score * 0.15 +
-            fee_score * 0.10
-        )
-        
-        return score
+        return _opportunity_score(net_profit, liquidity, bridge_time, bridge_fee)
     
     def generate_signal(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -306,7 +400,7 @@ class CrossChainArbitrageStrategy(BaseStrategy):
         max_position = risk_params.get('max_position_size', 0.15)
         
         # Time risk adjustment (longer bridge time = smaller position)
-        time_factor = max(1.0 - (bridge_time / self.max_bridge_time) * 0.5, 0.5)
+        time_factor = max(1.0 - bridge_time * self._half_inv_max_bridge_time, 0.5)
         
         # Calculate optimal size
         optimal_size = min(
@@ -6,13 +6,40 @@ Elite strategy for exploiting price differences across DEXs using flash loans.
 Targets 5-50% profit per trade with zero capital requirements.
 """
 
-from typing import Dict, Any, List
-from .base_strategy import BaseStrategy
+from operator import itemgetter
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
+from .base_strategy import BaseStrategy, _AnalysisCache, _TopRows, _gather_sources
 from ..config import Config
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Opportunity dict keys, in the order they are stored in analyze()'s survivor rows
+_OPPORTUNITY_FIELDS = (
+    'buy_exchange', 'sell_exchange', 'buy_price', 'sell_price',
+    'profit_percentage', 'available_liquidity',
+)
+
+
+def _tar_score(profit_pct: float, liquidity: float, gas_penalty: float) -> float:
+    """TAR score for one pair given the scan-wide gas penalty (gas impact x 10)."""
+    # Execution probability based on profit margin
+    execution_prob = profit_pct * 50.0  # 2% = 100% probability
+    execution_prob = 1.0 if 1.0 < execution_prob else execution_prob
+    
+    # Liquidity score (normalized)
+    liquidity_score = liquidity * 1e-5  # liquidity / 100000
+    liquidity_score = 10.0 if 10.0 < liquidity_score else liquidity_score
+    
+    # Calculate TAR
+    tar_score = (
+        profit_pct * 100 *           # Convert to percentage points
+        liquidity_score *             # Liquidity factor
+        execution_prob                # Execution probability
+    ) - gas_penalty                  # Gas cost penalty
+    
+    return 0 if 0 > tar_score else tar_score
+
 
 class FlashLoanArbitrageStrategy(BaseStrategy):
     """
@@ -25,6 +52,10 @@ class FlashLoanArbitrageStrategy(BaseStrategy):
     - Scores opportunities using TAR methodology
     """
     
+    # Flash loan arbitrage typically uses 300k-500k gas
+    _GAS_UNITS = 400_000
+    _DEFAULT_ETH_PRICE = 2000.0
+    
     def __init__(self, 
                  min_profit_threshold: float = None,
                  max_gas_cost: float = None,
@@ -61,17 +92,21 @@ class FlashLoanArbitrageStrategy(BaseStrategy):
                    f"max_gas=${self.max_gas_cost}, "
                    f"min_liquidity=${self.min_liquidity:,.0f}")
         
+        # Recent pair-scan results keyed by the extracted market snapshot
+        self._analysis_cache = _AnalysisCache()
+        
         # Strategy-specific tracking
         self.opportunities_found = 0
         self.opportunities_executed = 0
         self.total_tar_score = 0.0
     
-    def analyze(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze(self, market_data: Dict[str, Any], top_k: Optional[int] = None) -> Dict[str, Any]:
         """
         Analyze market for flash loan arbitrage opportunities.
         
         Args:
             market_data: Market data including exchange prices
+            top_k: Return only the best top_k opportunities (default: all)
             
         Returns:
             Analysis with opportunities and TAR scores
@@ -81,77 +116,112 @@ class FlashLoanArbitrageStrategy(BaseStrategy):
         if len(exchanges) < 2:
             return {'opportunities': [], 'best_opportunity': None}
         
-        opportunities = []
+        # Pull each priced exchange's fields once instead of once per pair
+        venues = []
+        for position, exchange in enumerate(exchanges):
+            price = exchange.get('price', 0)
+            if price <= 0:
+                continue
+            venues.append((price, -position, exchange.get('liquidity', 0), exchange.get('name')))
+        
+        # Order by price so the earlier venue of every pair is the buy side.
+        # Equal prices keep the original tie-break (buy on the later input).
+        venues.sort(key=itemgetter(0, 1))
+        
+        # Gas cost does not depend on the pair, so estimate it once per scan
+        gas_price = market_data.get('gas_price', 50)
+        gas_cost = self._estimate_gas_cost(
+            gas_price,
+            market_data.get('eth_price', self._DEFAULT_ETH_PRICE)
+        )
+        gas_penalty = min(gas_cost / self.max_gas_cost, 1.0) * 10
+        
+        # Repeated snapshots reuse the pair scan; only the result dicts are rebuilt
+        key = (tuple(venues), top_k, gas_penalty, self.min_profit_threshold, self.min_liquidity)
+        scan = self._analysis_cache.get(key)
+        if scan is None:
+            scan = self._scan_pairs(venues, gas_penalty, top_k)
+            self._analysis_cache.put(key, scan)
+        best_rows, total = scan
+        
+        opportunities = [
+            dict(zip(_OPPORTUNITY_FIELDS, row[1:]), tar_score=row[0], estimated_gas_cost=gas_cost)
+            for row in best_rows
+        ]
+        
+        self.opportunities_found += total
+        
+        return {
+            'opportunities': opportunities,
+            'best_opportunity': opportunities[0] if opportunities else None,
+            'total_opportunities': total,
+        }
+    
+    def _scan_pairs(self,
+                    venues: List[tuple],
+                    gas_penalty: float,
+                    top_k: Optional[int]) -> Tuple[tuple, int]:
+        """Score every profitable exchange pair; return the best rows and survivor count."""
+        prices = [venue[0] for venue in venues]
+        liquidities = [venue[2] for venue in venues]
+        names = [venue[3] for venue in venues]
+        min_profit = self.min_profit_threshold
+        min_liquidity = self.min_liquidity
+        rows = _TopRows(top_k)
         
         # Find arbitrage opportunities between all exchange pairs
-        for i in range(len(exchanges)):
-            for j in range(i + 1, len(exchanges)):
-                exchange_a = exchanges[i]
-                exchange_b = exchanges[j]
-                
-                price_a = exchange_a.get('price', 0)
-                price_b = exchange_b.get('price', 0)
-                liquidity_a = exchange_a.get('liquidity', 0)
-                liquidity_b = exchange_b.get('liquidity', 0)
+        count = len(venues)
+        for i in range(count):
+            buy_price = prices[i]
+            liquidity_a = liquidities[i]
+            
+            for j in range(i + 1, count):
+                sell_price = prices[j]
                 
-                if price_a <= 0 or price_b <= 0:
+                profit_pct = (sell_price - buy_price) / buy_price
+                if profit_pct < min_profit:
                     continue
                 
-                # Calculate price difference
-                if price_a < price_b:
-                    buy_exchange = exchange_a['name']
-                    sell_exchange = exchange_b['name']
-                    buy_price = price_a
-                    sell_price = price_b
-                    available_liquidity = min(liquidity_a, liquidity_b)
-                else:
-                    buy_exchange = exchange_b['name']
-                    sell_exchange = exchange_a['name']
-                    buy_price = price_b
-                    sell_price = price_a
-                    available_liquidity = min(liquidity_a, liquidity_b)
-                
-                # Calculate profit percentage
-                profit_pct = (sell_price - buy_price) / buy_price
+                liquidity_b = liquidities[j]
+                available_liquidity = liquidity_b if liquidity_b < liquidity_a else liquidity_a
+                if available_liquidity < min_liquidity:
+                    continue
                 
-                # Calculate TAR score
-                tar_score = self._calculate_tar_score(
-                    profit_pct,
-                    available_liquidity,
-                    market_data.get('gas_price', 50)
-                )
+                # Calculate TAR score only for pairs that pass the cheap checks
+                tar_score = _tar_score(profit_pct, available_liquidity, gas_penalty)
                 
-                # Check if opportunity meets criteria
-                if (profit_pct >= self.min_profit_threshold and
-                    available_liquidity >= self.min_liquidity and
-                    tar_score > 0):
-                    
-                    opportunities.append({
-                        'buy_exchange': buy_exchange,
-                        'sell_exchange': sell_exchange,
-                        'buy_price': buy_price,
-                        'sell_price': sell_price,
-                        'profit_percentage': profit_pct,
-                        'available_liquidity': available_liquidity,
-                        'tar_score': tar_score,
-                        'estimated_gas_cost': self._estimate_gas_cost(market_data.get('gas_price', 50)),
-                    })
-        
-        # Sort by TAR score
-        opportunities.sort(key=lambda x: x['tar_score'], reverse=True)
-        
-        self.opportunities_found += len(opportunities)
+                if tar_score > 0:
+                    rows.add((
+                        tar_score, names[i], names[j], buy_price, sell_price,
+                        profit_pct, available_liquidity,
+                    ))
+        
+        # Sorted by TAR score; a capped scan only ever holds top_k rows
+        return rows.best(), rows.count
+    
+    async def gather_exchange_data(
+            self,
+            sources: Dict[str, Callable[[], Awaitable[Dict[str, Any]]]]) -> Dict[str, Any]:
+        """
+        Fetch per-exchange price data concurrently and shape it for analyze().
         
+        Args:
+            sources: Coroutine functions keyed by exchange name, each returning
+                a dict with at least 'price' and 'liquidity'
+            
+        Returns:
+            Market data with an 'exchanges' list; failed exchanges are omitted
+        """
+        gathered = await _gather_sources(sources)
         return {
-            'opportunities': opportunities,
-            'best_opportunity': opportunities[0] if opportunities else None,
-            'total_opportunities': len(opportunities),
+            'exchanges': [dict(data, name=name) for name, data in gathered.items()]
         }
     
     def _calculate_tar_score(self, 
                             profit_pct: float,
                             liquidity: float,
-                            gas_price: float) -> float:
+                            gas_price: float,
+                            gas_cost: Optional[float] = None) -> float:
         """
         Calculate Total Arbitrage Return (TAR) score.
         
@@ -162,44 +232,32 @@ class FlashLoanArbitrageStrategy(BaseStrategy):
             profit_pct: Profit percentage
             liquidity: Available liquidity
             gas_price: Current gas price
+            gas_cost: Precomputed gas cost in USD for gas_price, if available
             
         Returns:
             TAR score (higher is better)
         """
-        # Execution probability based on profit margin
-        execution_prob = min(profit_pct / 0.02, 1.0)  # 2% = 100% probability
-        
-        # Liquidity score (normalized)
-        liquidity_score = min(liquidity / 100000, 10.0)
-        
-        # Gas cost impact (negative factor)
-        gas_cost = self._estimate_gas_cost(gas_price)
+        if gas_cost is None:
+            gas_cost = self._estimate_gas_cost(gas_price)
         gas_impact = min(gas_cost / self.max_gas_cost, 1.0)
         
-        # Calculate TAR
-        tar_score = (
-            profit_pct * 100 *           # Convert to percentage points
-            liquidity_score *             # Liquidity factor
-            execution_prob                # Execution probability
-        ) - (gas_impact * 10)            # Gas cost penalty
-        
-        return max(tar_score, 0)
+        return _tar_score(profit_pct, liquidity, gas_impact * 10)
     
-    def _estimate_gas_cost(self, gas_price: float) -> float:
+    def _estimate_gas_cost(self, gas_price: float, eth_price: Optional[float] = None) -> float:
         """
         Estimate gas cost for flash loan arbitrage.
         
         Args:
             gas_price: Gas price in gwei
+            eth_price: ETH price in USD (defaults to a fixed estimate)
             
         Returns:
             Estimated gas cost in USD
         """
-        # Flash loan arbitrage typically uses 300k-500k gas
-        gas_units = 400000
-        eth_price = 2000  # Simplified, should be from market data
+        if eth_price is None:
+            eth_price = self._DEFAULT_ETH_PRICE
         
-        cost_eth = (gas_units * gas_price) / 1e9
+        cost_eth = (self._GAS_UNITS * gas_price) / 1e9
         cost_usd = cost_eth * eth_price
         
         return cost_usd
@@ -6,13 +6,65 @@ Elite strategy for hunting underwater positions and executing profitable liquida
 Targets 10-100% profit per liquidation with minimal risk.
 """
 
-from typing import Dict, Any, List
-from .base_strategy import BaseStrategy
+from bisect import bisect_right
+from typing import Dict, Any, List, Optional
+from .base_strategy import BaseStrategy, _TopRows
 from ..config import Config
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Health factor bounds and the urgency score below each one (1.0 past the last)
+_URGENCY_THRESHOLDS = (1.0, 1.01, 1.02, 1.03)
+_URGENCY_SCORES = (
+    10.0,  # Critical - liquidatable now
+    8.0,   # Very high urgency
+    5.0,   # High urgency
+    3.0,   # Medium urgency
+    1.0,   # Low urgency
+)
+
+
+def _health_factor(collateral_amount: float,
+                   collateral_price: float,
+                   debt_amount: float,
+                   debt_price: float,
+                   liquidation_threshold: float) -> float:
+    """Health factor = (collateral value x liquidation threshold) / debt value."""
+    if debt_price == 0 or debt_amount == 0:
+        return float('inf')
+    
+    collateral_value = collateral_amount * collateral_price
+    debt_value = debt_amount * debt_price
+    
+    return (collateral_value * liquidation_threshold) / debt_value
+
+
+def _liquidation_profit(debt_amount: float,
+                        debt_price: float,
+                        collateral_price: float,
+                        liquidation_bonus: float,
+                        max_liquidation_pct: float,
+                        gas_cost: float) -> float:
+    """Net liquidation profit as a fraction of the debt repaid."""
+    # Amount of debt we can liquidate (typically 50% of position)
+    liquidatable_debt = debt_amount * max_liquidation_pct
+    
+    # Value we need to pay
+    liquidation_value = liquidatable_debt * debt_price
+    
+    # Collateral we receive (with bonus)
+    collateral_received = (liquidatable_debt * debt_price / collateral_price) * (1 + liquidation_bonus)
+    collateral_value = collateral_received * collateral_price
+    
+    # Net profit after gas
+    net_profit = (collateral_value - liquidation_value) - gas_cost
+    
+    # Return as percentage of capital required
+    if liquidation_value > 0:
+        return net_profit / liquidation_value
+    return 0.0
+
 
 class LiquidationHunterStrategy(BaseStrategy):
     """
@@ -25,6 +77,10 @@ class LiquidationHunterStrategy(BaseStrategy):
     - Executes liquidations for maximum profit
     """
     
+    # Liquidations use ~300k gas; ETH price is a fixed estimate
+    _GAS_UNITS = 300_000
+    _ETH_PRICE = 2000.0
+    
     def __init__(self,
                  min_health_factor: float = None,
                  min_liquidation_profit: float = None,
@@ -56,21 +112,22 @@ class LiquidationHunterStrategy(BaseStrategy):
             else Config.get_max_gas_price_gwei()
         )
         
-        logger.info(f"Liquidation Hunter initialized with config: "
-                   f"min_health_factor={self.min_health_factor:.2f}, "
-                   f"min_profit={self.min_liquidation_profit*100:.2f}%, "
-                   f"max_gas={self.max_gas_price} gwei")
+        logger.info("Liquidation Hunter initialized with config: "
+                    "min_health_factor=%.2f, min_profit=%.2f%%, max_gas=%s gwei",
+                    self.min_health_factor, self.min_liquidation_profit * 100,
+                    self.max_gas_price)
         
         self.positions_monitored = 0
         self.liquidations_executed = 0
         self.average_liquidation_profit = 0.0
     
-    def analyze(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze(self, market_data: Dict[str, Any], top_k: Optional[int] = None) -> Dict[str, Any]:
         """
         Analyze lending protocols for liquidation opportunities.
         
         Args:
             market_data: Market data including protocol positions
+            top_k: Return only the best top_k opportunities (default: all)
             
         Returns:
             Analysis with liquidation opportunities
@@ -82,45 +139,68 @@ class LiquidationHunterStrategy(BaseStrategy):
         if not positions:
             return {'opportunities': [], 'best_opportunity': None}
         
-        opportunities = []
+        rows = _TopRows(top_k)
         self.positions_monitored += len(positions)
         
+        # Per-scan constants, bound once instead of per position
+        min_health_factor = self.min_health_factor
+        min_liquidation_profit = self.min_liquidation_profit
+        gas_cost = self._estimate_gas_cost(gas_price, self._GAS_UNITS)
+        price_of = current_prices.get
+        
         for position in positions:
-            # Calculate health factor
-            health_factor = self._calculate_health_factor(position, current_prices)
+            # Read each position field once for both the health and profit checks
+            get = position.get
+            collateral_price = price_of(get('collateral_asset', ''), 0)
+            debt_price = price_of(get('debt_asset', ''), 0)
+            debt_amount = get('debt_amount', 0)
             
-            if health_factor >= self.min_health_factor:
+            health_factor = _health_factor(
+                get('collateral_amount', 0), collateral_price,
+                debt_amount, debt_price,
+                get('liquidation_threshold', 0.8)
+            )
+            
+            if health_factor >= min_health_factor:
                 continue  # Position is healthy
             
-            # Calculate liquidation profitability
-            liquidation_profit = self._calculate_liquidation_profit(
-                position, current_prices, gas_price
+            liquidation_bonus = get('liquidation_bonus', 0.05)
+            liquidation_profit = _liquidation_profit(
+                debt_amount, debt_price, collateral_price,
+                liquidation_bonus,
+                get('max_liquidation_pct', 0.5),
+                gas_cost
             )
             
-            if liquidation_profit >= self.min_liquidation_profit:
-                opportunities.append({
-                    'position_id': position.get('id'),
-                    'protocol': position.get('protocol', 'Unknown'),
-                    'collateral_asset': position.get('collateral_asset'),
-                    'debt_asset': position.get('debt_asset'),
-                    'collateral_amount': position.get('collateral_amount', 0),
-                    'debt_amount': position.get('debt_amount', 0),
-                    'health_factor': health_factor,
-                    'liquidation_profit': liquidation_profit,
-                    'liquidation_bonus': position.get('liquidation_bonus', 0.05),
-                    'urgency_score': self._calculate_urgency_score(health_factor),
-                })
-        
-        # Sort by profit potential and urgency
-        opportunities.sort(
-            key=lambda x: x['liquidation_profit'] * x['urgency_score'],
-            reverse=True
-        )
+            if liquidation_profit >= min_liquidation_profit:
+                urgency_score = _URGENCY_SCORES[bisect_right(_URGENCY_THRESHOLDS, health_factor)]
+                rows.add((
+                    liquidation_profit * urgency_score, position, debt_amount,
+                    health_factor, liquidation_profit, liquidation_bonus, urgency_score,
+                ))
+        
+        # Ranked by profit potential and urgency; dicts are built only for kept rows
+        opportunities = [
+            {
+                'position_id': position.get('id'),
+                'protocol': position.get('protocol', 'Unknown'),
+                'collateral_asset': position.get('collateral_asset'),
+                'debt_asset': position.get('debt_asset'),
+                'collateral_amount': position.get('collateral_amount', 0),
+                'debt_amount': debt_amount,
+                'health_factor': health_factor,
+                'liquidation_profit': liquidation_profit,
+                'liquidation_bonus': liquidation_bonus,
+                'urgency_score': urgency_score,
+            }
+            for (_, position, debt_amount, health_factor,
+                 liquidation_profit, liquidation_bonus, urgency_score) in rows.best()
+        ]
         
         return {
             'opportunities': opportunities,
             'best_opportunity': opportunities[0] if opportunities else None,
-            'total_opportunities': len(opportunities),
+            'total_opportunities': rows.count,
         }
     
     def _calculate_health_factor(self, 
@@ -138,24 +218,13 @@ class LiquidationHunterStrategy(BaseStrategy):
         Returns:
             Health factor (< 1.0 = liquidatable)
         """
-        collateral_asset = position.get('collateral_asset', '')
-        debt_asset = position.get('debt_asset', '')
-        collateral_amount = position.get('collateral_amount', 0)
-        debt_amount = position.get('debt_amount', 0)
-        liquidation_threshold = position.get('liquidation_threshold', 0.8)
-        
-        collateral_price = prices.get(collateral_asset, 0)
-        debt_price = prices.get(debt_asset, 0)
-        
-        if debt_price == 0 or debt_amount == 0:
-            return float('inf')
-        
-        collateral_value = collateral_amount * collateral_price
-        debt_value = debt_amount * debt_price
-        
-        health_factor = (collateral_value * liquidation_threshold) / debt_value
-        
-        return health_factor
+        return _health_factor(
+            position.get('collateral_amount', 0),
+            prices.get(position.get('collateral_asset', ''), 0),
+            position.get('debt_amount', 0),
+            prices.get(position.get('debt_asset', ''), 0),
+            position.get('liquidation_threshold', 0.8)
+        )
     
     def _calculate_liquidation_profit(self,
                                       position: Dict[str, Any],
@@ -172,44 +241,19 @@ class LiquidationHunterStrategy(BaseStrategy):
         Returns:
             Expected profit percentage
         """
-        liquidation_bonus = position.get('liquidation_bonus', 0.05)
-        collateral_asset = position.get('collateral_asset', '')
-        debt_asset = position.get('debt_asset', '')
-        debt_amount = position.get('debt_amount', 0)
-        
-        collateral_price = prices.get(collateral_asset, 0)
-        debt_price = prices.get(debt_asset, 0)
-        
-        # Amount of debt we can liquidate (typically 50% of position)
-        max_liquidation_pct = position.get('max_liquidation_pct', 0.5)
-        liquidatable_debt = debt_amount * max_liquidation_pct
-        
-        # Value we need to pay
-        liquidation_value = liquidatable_debt * debt_price
-        
-        # Collateral we receive (with bonus)
-        collateral_received = (liquidatable_debt * debt_price / collateral_price) * (1 + liquidation_bonus)
-        collateral_value = collateral_received * collateral_price
-        
-        # Gross profit
-        gross_profit = collateral_value - liquidation_value
-        
-        # Estimate gas cost (liquidations use ~300k gas)
-        gas_cost = self._estimate_gas_cost(gas_price, 300000)
-        
-        # Net profit
-        net_profit = gross_profit - gas_cost
-        
-        # Return as percentage of capital required
-        if liquidation_value > 0:
-            return net_profit / liquidation_value
-        return 0.0
+        return _liquidation_profit(
+            position.get('debt_amount', 0),
+            prices.get(position.get('debt_asset', ''), 0),
+            prices.get(position.get('collateral_asset', ''), 0),
+            position.get('liquidation_bonus', 0.05),
+            position.get('max_liquidation_pct', 0.5),
+            self._estimate_gas_cost(gas_price, self._GAS_UNITS)
+        )
     
     def _estimate_gas_cost(self, gas_price: float, gas_units: int) -> float:
         """Estimate gas cost in USD."""
-        eth_price = 2000  # Simplified
         cost_eth = (gas_units * gas_price) / 1e9
-        return cost_eth * eth_price
+        return cost_eth * self._ETH_PRICE
     
     def _calculate_urgency_score(self, health_factor: float) -> float:
         """
@@ -223,16 +267,7 @@ class LiquidationHunterStrategy(BaseStrategy):
         Returns:
             Urgency score (0-10)
         """
-        if health_factor < 1.0:
-            return 10.0  # Critical - liquidatable now
-        elif health_factor < 1.01:
-            return 8.0   # Very high urgency
-        elif health_factor < 1.02:
-            return 5.0   # High urgency
-        elif health_factor < 1.03:
-            return 3.0   # Medium urgency
-        else:
-            return 1.0   # Low urgency
+        return _URGENCY_SCORES[bisect_right(_URGENCY_THRESHOLDS, health_factor)]
     
     def generate_signal(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Generate liquidation signal."""
@@ -6,13 +6,114 @@ Elite strategy for sandwich attacks, front-running detection, and MEV opportunit
 Targets 5-200% profit per transaction with minimal risk.
 """
 
-from typing import Dict, Any, List
-from .base_strategy import BaseStrategy
+from typing import Dict, Any, List, Optional, Tuple
+from .base_strategy import BaseStrategy, _TopRows
 from ..config import Config
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Pending transaction types worth sandwiching
+_MEV_TX_TYPES = ('swap', 'trade')
+
+# Targets bidding above this gas price (gwei) are likely front-running us
+_MAX_TARGET_GAS_PRICE = 500
+
+
+def _get_amount_out(amount_in: float, reserve_in: float, reserve_out: float) -> float:
+    """Output amount for a constant product AMM swap with a 0.3% fee."""
+    if reserve_in == 0 or reserve_out == 0:
+        return 0
+    
+    amount_in_with_fee = amount_in * 0.997  # 0.3% fee
+    numerator = amount_in_with_fee * reserve_out
+    denominator = reserve_in + amount_in_with_fee
+    
+    return numerator / denominator if denominator > 0 else 0
+
+
+def _optimal_front_run(target_amount: float, reserve_in: float) -> float:
+    """Front-run size as a fraction of the target, scaled by pool depth."""
+    # Use 50% of target as starting point
+    optimal = target_amount * 0.5
+    
+    # Adjust based on pool depth
+    pool_depth_ratio = target_amount / reserve_in
+    
+    if pool_depth_ratio > 0.1:  # Large trade relative to pool
+        optimal = target_amount * 0.3  # Use smaller front-run
+    elif pool_depth_ratio < 0.01:  # Small trade relative to pool
+        optimal = target_amount * 0.7  # Can use larger front-run
+    
+    return optimal
+
+
+def _mev_score(profit_pct: float, target_size: float, slippage: float) -> float:
+    """MEV opportunity score for a sandwich (higher is better)."""
+    # Profit component (weight: 50%)
+    profit_score = profit_pct * 100
+    
+    # Size component (weight: 30%)
+    size_score = min(target_size / 50000, 10)
+    
+    # Low slippage bonus (weight: 20%)
+    slippage_score = max(10 - slippage * 100, 0)
+    
+    return (
+        profit_score * 0.50 +
+        size_score * 0.30 +
+        slippage_score * 0.20
+    )
+
+
+def _sandwich(target_amount: float,
+              reserve_in: float,
+              reserve_out: float,
+              max_slippage: float) -> Optional[Tuple[float, float, float, float, float]]:
+    """
+    Simulate a sandwich around one target swap.
+    
+    Returns:
+        (front_run_amount, back_run_amount, profit_pct, slippage, mev_score),
+        or None when the pool is empty, the front-run is zero, or the
+        victim slippage exceeds max_slippage
+    """
+    if reserve_in == 0 or reserve_out == 0:
+        return None
+    
+    front_run = _optimal_front_run(target_amount, reserve_in)
+    if front_run == 0:
+        return None
+    
+    # Front-run effect
+    new_reserve_in = reserve_in + front_run
+    tokens_out_front = _get_amount_out(front_run, reserve_in, reserve_out)
+    new_reserve_out = reserve_out - tokens_out_front
+    
+    # Victim trade effect
+    new_reserve_in2 = new_reserve_in + target_amount
+    tokens_out_victim = _get_amount_out(target_amount, new_reserve_in, new_reserve_out)
+    new_reserve_out2 = new_reserve_out - tokens_out_victim
+    
+    # Back-run: sell what we bought
+    tokens_out_back = _get_amount_out(tokens_out_front, new_reserve_out2, new_reserve_in2)
+    
+    profit_amount = tokens_out_back - front_run
+    profit_pct = profit_amount / front_run if front_run > 0 else 0
+    
+    # Slippage caused to victim
+    original_price = reserve_out / reserve_in
+    victim_price = tokens_out_victim / target_amount
+    slippage = abs(victim_price - original_price) / original_price
+    
+    if slippage > max_slippage:
+        return None  # Would cause too much slippage (detectable/unfair)
+    
+    return (
+        front_run, tokens_out_front, profit_pct, slippage,
+        _mev_score(profit_pct, target_amount, slippage),
+    )
+
 
 class MEVStrategy(BaseStrategy):
     """
@@ -56,21 +157,22 @@ class MEVStrategy(BaseStrategy):
             else Config.get_max_slippage()
         )
         
-        logger.info(f"MEV Strategy initialized with config: "
-                   f"min_tx_size=${self.min_transaction_size:,.0f}, "
-                   f"min_profit={self.min_expected_profit*100:.2f}%, "
-                   f"max_slippage={self.max_slippage_impact*100:.2f}%")
+        logger.info("MEV Strategy initialized with config: "
+                    "min_tx_size=$%s, min_profit=%.2f%%, max_slippage=%.2f%%",
+                    format(self.min_transaction_size, ',.0f'), self.min_expected_profit * 100,
+                    self.max_slippage_impact * 100)
         
         self.mev_opportunities_detected = 0
         self.sandwich_attacks_executed = 0
         self.front_run_successes = 0
     
-    def analyze(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze(self, market_data: Dict[str, Any], top_k: Optional[int] = None) -> Dict[str, Any]:
         """
         Analyze mempool for MEV opportunities.
         
         Args:
             market_data: Market data including pending transactions
+            top_k: Return only the best top_k opportunities (default: all)
             
         Returns:
             Analysis with MEV opportunities
@@ -81,40 +183,69 @@ class MEVStrategy(BaseStrategy):
         if not pending_txs:
             return {'opportunities': [], 'best_opportunity': None}
         
-        opportunities = []
+        rows = _TopRows(top_k)
+        min_transaction_size = self.min_transaction_size
+        min_expected_profit = self.min_expected_profit
+        max_slippage = self.max_slippage_impact
+        pool_of = pool_data.get
+        
+        # Reserves resolved once per pool; most pending swaps share a few pools
+        reserves_by_pool = {}
         
         for tx in pending_txs:
-            # Analyze transaction for MEV potential
-            if not self._is_mev_target(tx):
+            # Same checks as _is_mev_target, inlined; most traffic fails the type test
+            get = tx.get
+            if get('type', '') not in _MEV_TX_TYPES:
+                continue
+            target_amount = get('value', 0)
+            if target_amount < min_transaction_size:
                 continue
+            if get('gas_price', 0) > _MAX_TARGET_GAS_PRICE:
+                continue
+            
+            pool_id = get('pool')
+            reserves = reserves_by_pool.get(pool_id)
+            if reserves is None:
+                pool = pool_of(pool_id, {})
+                reserves = reserves_by_pool[pool_id] = (
+                    pool.get('reserve_in', 0), pool.get('reserve_out', 0)
+                )
+            reserve_in, reserve_out = reserves
+            if reserve_in == 0 or reserve_out == 0:
+                continue  # Empty pool, nothing to sandwich
             
-            # Calculate sandwich attack profitability
-            sandwich_result = self._calculate_sandwich_profit(tx, pool_data)
+            # Simulate the sandwich directly on the pool reserves
+            result = _sandwich(target_amount, reserve_in, reserve_out, max_slippage)
             
-            if sandwich_result and sandwich_result['profit'] >= self.min_expected_profit:
-                opportunities.append({
-                    'type': 'sandwich',
-                    'target_tx': tx.get('hash'),
-                    'target_size': tx.get('value', 0),
-                    'pool': tx.get('pool'),
-                    'token_in': tx.get('token_in'),
-                    'token_out': tx.get('token_out'),
-                    'front_run_amount': sandwich_result['front_run_amount'],
-                    'back_run_amount': sandwich_result['back_run_amount'],
-                    'expected_profit': sandwich_result['profit'],
-                    'slippage_caused': sandwich_result['slippage'],
-                    'mev_score': sandwich_result['mev_score'],
-                })
-        
-        # Sort by MEV score
-        opportunities.sort(key=lambda x: x['mev_score'], reverse=True)
-        
-        self.mev_opportunities_detected += len(opportunities)
+            if result is not None and result[2] >= min_expected_profit:
+                # Score first so rows rank by MEV score
+                rows.add((result[4], tx, pool_id, target_amount) + result[:4])
+        
+        # Ranked by MEV score; dicts are built only for kept rows
+        opportunities = [
+            {
+                'type': 'sandwich',
+                'target_tx': tx.get('hash'),
+                'target_size': target_amount,
+                'pool': pool_id,
+                'token_in': tx.get('token_in'),
+                'token_out': tx.get('token_out'),
+                'front_run_amount': front_run_amount,
+                'back_run_amount': back_run_amount,
+                'expected_profit': profit,
+                'slippage_caused': slippage,
+                'mev_score': mev_score,
+            }
+            for (mev_score, tx, pool_id, target_amount,
+                 front_run_amount, back_run_amount, profit, slippage) in rows.best()
+        ]
+        
+        self.mev_opportunities_detected += rows.count
         
         return {
             'opportunities': opportunities,
             'best_opportunity': opportunities[0] if opportunities else None,
-            'total_opportunities': len(opportunities),
+            'total_opportunities': rows.count,
         }
     
     def _is_mev_target(self, tx: Dict[str, Any]) -> bool:
@@ -127,19 +258,16 @@ class MEVStrategy(BaseStrategy):
         Returns:
             True if transaction is MEV target
         """
-        tx_value = tx.get('value', 0)
-        tx_type = tx.get('type', '')
-        gas_price = tx.get('gas_price', 0)
-        
-        # Must be a swap transaction with significant size
-        if tx_type not in ['swap', 'trade']:
+        # Cheapest and most selective check first: only swaps qualify
+        if tx.get('type', '') not in _MEV_TX_TYPES:
             return False
         
-        if tx_value < self.min_transaction_size:
+        # Must be of significant size
+        if tx.get('value', 0) < self.min_transaction_size:
             return False
         
         # Must have reasonable gas price (not trying to front-run us)
-        if gas_price > 500:  # 500 gwei
+        if tx.get('gas_price', 0) > _MAX_TARGET_GAS_PRICE:
             return False
         
         return True
@@ -162,61 +290,21 @@ class MEVStrategy(BaseStrategy):
         Returns:
             Sandwich attack parameters and profitability
         """
-        pool_id = target_tx.get('pool')
-        target_amount = target_tx.get('value', 0)
-        
-        pool = pool_data.get(pool_id, {})
-        reserve_in = pool.get('reserve_in', 0)
-        reserve_out = pool.get('reserve_out', 0)
-        
-        if reserve_in == 0 or reserve_out == 0:
-            return None
-        
-        # Calculate optimal front-run size (fraction of target)
-        optimal_front_run = self._calculate_optimal_front_run(
-            target_amount, reserve_in, reserve_out
+        pool = pool_data.get(target_tx.get('pool'), {})
+        result = _sandwich(
+            target_tx.get('value', 0),
+            pool.get('reserve_in', 0),
+            pool.get('reserve_out', 0),
+            self.max_slippage_impact
         )
-        
-        if optimal_front_run == 0:
+        if result is None:
             return None
         
-        # Simulate price impact
-        # Front-run effect
-        new_reserve_in = reserve_in + optimal_front_run
-        tokens_out_front = self._get_amount_out(optimal_front_run, reserve_in, reserve_out)
-        new_reserve_out = reserve_out - tokens_out_front
-        
-        # Victim trade effect
-        new_reserve_in2 = new_reserve_in + target_amount
-        tokens_out_victim = self._get_amount_out(target_amount, new_reserve_in, new_reserve_out)
-        new_reserve_out2 = new_reserve_out - tokens_out_victim
-        
-        # Back-run: sell what we bought
-        tokens_in_back = tokens_out_front
-        tokens_out_back = self._get_amount_out(tokens_in_back, new_reserve_out2, new_reserve_in2)
-        
-        # Calculate profit
-        profit_amount = tokens_out_back - optimal_front_run
-        profit_pct = profit_amount / optimal_front_run if optimal_front_run > 0 else 0
-        
-        # Calculate slippage caused to victim
-        original_price = reserve_out / reserve_in
-        victim_price = tokens_out_victim / target_amount
-        slippage = abs(victim_price - original_price) / original_price
-        
-        # Check constraints
-        if slippage > self.max_slippage_impact:
-            return None  # Would cause too much slippage (detectable/unfair)
-        
-        # Calculate MEV score
-        mev_score = self._calculate_mev_score(
-            profit_pct, target_amount, slippage
-        )
-        
+        front_run_amount, back_run_amount, profit, slippage, mev_score = result
         return {
-            'front_run_amount': optimal_front_run,
-            'back_run_amount': tokens_out_front,
-            'profit': profit_pct,
+            'front_run_amount': front_run_amount,
+            'back_run_amount': back_run_amount,
+            'profit': profit,
             'slippage': slippage,
             'mev_score': mev_score,
         }
@@ -238,18 +326,7 @@ class MEVStrategy(BaseStrategy):
         Returns:
             Optimal front-run amount
         """
-        # Use 50% of target as starting point
-        optimal = target_amount * 0.5
-        
-        # Adjust based on pool depth
-        pool_depth_ratio = target_amount / reserve_in
-        
-        if pool_depth_ratio > 0.1:  # Large trade relative to pool
-            optimal = target_amount * 0.3  # Use smaller front-run
-        elif pool_depth_ratio < 0.01:  # Small trade relative to pool
-            optimal = target_amount * 0.7  # Can use larger front-run
-        
-        return optimal
+        return _optimal_front_run(target_amount, reserve_in)
     
     def _get_amount_out(self, amount_in: float, reserve_in: float, reserve_out: float) -> float:
         """
@@ -263,14 +340,7 @@ class MEVStrategy(BaseStrategy):
         Returns:
             Output amount
         """
-        if reserve_in == 0 or reserve_out == 0:
-            return 0
-        
-        amount_in_with_fee = amount_in * 0.997  # 0.3% fee
-        numerator = amount_in_with_fee * reserve_out
-        denominator = reserve_in + amount_in_with_fee
-        
-        return numerator / denominator if denominator > 0 else 0
+        return _get_amount_out(amount_in, reserve_in, reserve_out)
     
     def _calculate_mev_score(self,
                             profit_pct: float,
@@ -287,22 +357,7 @@ class MEVStrategy(BaseStrategy):
         Returns:
             MEV score (higher is better)
         """
-        # Profit component (weight: 50%)
-        profit_score = profit_pct * 100
-        
-        # Size component (weight: 30%)
-        size_score = min(target_size / 50000, 10)
-        
-        # Low slippage bonus (weight: 20%)
-        slippage_score = max(10 - slippage * 100, 0)
-        
-        score = (
-            profit_score * 0.50 +
-            size_score * 0.30 +
-            slippage_score * 0.20
-        )
-        
-        return score
+        return _mev_score(profit_pct, target_size, slippage)
     
     def generate_signal(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Generate MEV execution signal."""
@@ -6,14 +6,68 @@ Advanced strategy using statistical models for mean-reversion arbitrage.
 Targets 20-80% APY with low-risk statistical edge.
 """
 
-from typing import Dict, Any, List
-from .base_strategy import BaseStrategy
+from operator import mul, sub
+from typing import Dict, Any, List, Optional, Tuple
+from .base_strategy import BaseStrategy, _AnalysisCache, _TopRows
 from ..config import Config
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _centered(prices: List[float], n: int) -> Tuple[List[float], float]:
+    """Deviations of the last n prices from their mean, and their sum of squares."""
+    window = prices[-n:]
+    mean = sum(window) / n
+    deviations = [price - mean for price in window]
+    return deviations, sum(map(mul, deviations, deviations))
+
+
+def _centered_correlation(centered_a: Tuple[List[float], float],
+                          centered_b: Tuple[List[float], float]) -> float:
+    """Pearson correlation of two equal-length series prepared by _centered()."""
+    deviations_a, sum_sq_a = centered_a
+    deviations_b, sum_sq_b = centered_b
+    
+    denominator = (sum_sq_a * sum_sq_b) ** 0.5
+    
+    if denominator == 0:
+        return 0.0
+    
+    return sum(map(mul, deviations_a, deviations_b)) / denominator
+
+
+def _correlation(prices_a: List[float], prices_b: List[float]) -> float:
+    """Pearson correlation over the most recent common window of two series."""
+    n = min(len(prices_a), len(prices_b))
+    if n < 2:
+        return 0.0
+    
+    return _centered_correlation(_centered(prices_a, n), _centered(prices_b, n))
+
+
+def _z_score(spread: List[float]) -> float:
+    """Z-score of the latest spread against the population mean and deviation."""
+    count = len(spread)
+    if count < 2:
+        return 0.0
+    
+    mean = sum(spread) / count
+    deviations = [value - mean for value in spread]
+    std_dev = (sum(map(mul, deviations, deviations)) / count) ** 0.5
+    
+    if std_dev == 0:
+        return 0.0
+    
+    return deviations[-1] / std_dev
+
+
+def _spread_stats(prices_a: List[float], prices_b: List[float]) -> Tuple[float, float]:
+    """Z-score and latest value of the spread between two series in one pass."""
+    spread = list(map(sub, prices_a, prices_b))
+    return _z_score(spread), (spread[-1] if spread else 0)
+
+
 class StatisticalArbitrageStrategy(BaseStrategy):
     """
     Statistical arbitrage using correlation and co-integration analysis.
@@ -48,13 +102,23 @@ class StatisticalArbitrageStrategy(BaseStrategy):
         
         self.pairs_analyzed = 0
         self.mean_reversion_trades = 0
+        
+        # Pair statistics keyed by the caller's price_history version; repeated
+        # snapshots of the same version skip the correlation and spread passes
+        self._pair_cache = _AnalysisCache()
+        self._pair_cache_hits = 0
+        self._pair_cache_misses = 0
     
-    def analyze(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze(self, market_data: Dict[str, Any], top_k: Optional[int] = None) -> Dict[str, Any]:
         """
         Analyze market for statistical arbitrage opportunities.
         
         Args:
-            market_data: Market data with price history
+            market_data: Market data with price history. An optional
+                'history_version' (any hashable the caller bumps whenever
+                price_history changes) lets unchanged snapshots reuse pair
+                statistics; without it every pair is recomputed.
+            top_k: Return only the best top_k opportunities (default: all)
             
         Returns:
             Analysis with stat arb opportunities
@@ -65,7 +129,17 @@ class StatisticalArbitrageStrategy(BaseStrategy):
         if not pairs or not price_history:
             return {'opportunities': [], 'best_opportunity': None}
         
-        opportunities = []
+        rows = _TopRows(top_k)
+        
+        # Only a caller-supplied version makes a cache key cheap enough to pay off
+        history_version = market_data.get('history_version')
+        pair_cache = self._pair_cache if history_version is not None else None
+        if pair_cache is not None and pair_cache.maxsize < len(pairs):
+            pair_cache.maxsize = len(pairs)
+        
+        # Each asset's deviations and sum of squares are computed once per
+        # window length and shared by every pair that uses the asset
+        centered_by_asset = {}
         
         for pair in pairs:
             asset_a = pair.get('asset_a')
@@ -80,94 +154,90 @@ class StatisticalArbitrageStrategy(BaseStrategy):
             
             self.pairs_analyzed += 1
             
-            # Calculate correlation
-            correlation = self._calculate_correlation(prices_a, prices_b)
+            # Cached entries hold the correlation and, once computed, the spread stats
+            key = (asset_a, asset_b, history_version)
+            cached = pair_cache.get(key) if pair_cache is not None else None
+            if cached is not None:
+                self._pair_cache_hits += 1
+                correlation, spread_stats = cached
+            else:
+                if pair_cache is not None:
+                    self._pair_cache_misses += 1
+                spread_stats = None
+                
+                # Calculate correlation over the most recent common window
+                n = min(len(prices_a), len(prices_b))
+                if n < 2:
+                    correlation = 0.0
+                else:
+                    centered_a = centered_by_asset.get((asset_a, n))
+                    if centered_a is None:
+                        centered_a = centered_by_asset[(asset_a, n)] = _centered(prices_a, n)
+                    centered_b = centered_by_asset.get((asset_b, n))
+                    if centered_b is None:
+                        centered_b = centered_by_asset[(asset_b, n)] = _centered(prices_b, n)
+                    correlation = _centered_correlation(centered_a, centered_b)
             
             if abs(correlation) < self.correlation_threshold:
+                if cached is None and pair_cache is not None:
+                    pair_cache.put(key, (correlation, None))
                 continue  # Not correlated enough
             
-            # Calculate spread
-            spread = self._calculate_spread(prices_a, prices_b)
-            
-            # Calculate z-score
-            z_score = self._calculate_z_score(spread)
+            # Spread z-score and latest spread from a single spread series
+            if spread_stats is None:
+                spread_stats = _spread_stats(prices_a, prices_b)
+                if pair_cache is not None:
+                    pair_cache.put(key, (correlation, spread_stats))
+            z_score, last_spread = spread_stats
             
             # Check for entry signal
             if abs(z_score) >= self.z_score_threshold:
-                opportunities.append({
-                    'asset_a': asset_a,
-                    'asset_b': asset_b,
-                    'correlation': correlation,
-                    'z_score': z_score,
-                    'spread': spread[-1] if spread else 0,
-                    'signal': 'LONG_A_SHORT_B' if z_score < 0 else 'SHORT_A_LONG_B',
-                    'confidence': min(abs(z_score) / 3.0, 1.0),
-                    'mean_reversion_score': self._calculate_mean_reversion_score(
-                        z_score, correlation
-                    ),
-                })
-        
-        # Sort by mean reversion score
-        opportunities.sort(key=lambda x: x['mean_reversion_score'], reverse=True)
+                confidence = abs(z_score) / 3.0
+                rows.add((
+                    self._calculate_mean_reversion_score(z_score, correlation),
+                    asset_a, asset_b, correlation, z_score, last_spread,
+                    1.0 if 1.0 < confidence else confidence,
+                ))
+        
+        # Ranked by mean reversion score; dicts are built only for kept rows
+        opportunities = [
+            {
+                'asset_a': asset_a,
+                'asset_b': asset_b,
+                'correlation': correlation,
+                'z_score': z_score,
+                'spread': last_spread,
+                'signal': 'LONG_A_SHORT_B' if z_score < 0 else 'SHORT_A_LONG_B',
+                'confidence': confidence,
+                'mean_reversion_score': mean_reversion_score,
+            }
+            for (mean_reversion_score, asset_a, asset_b,
+                 correlation, z_score, last_spread, confidence) in rows.best()
+        ]
         
         return {
             'opportunities': opportunities,
             'best_opportunity': opportunities[0] if opportunities else None,
-            'total_opportunities': len(opportunities),
+            'total_opportunities': rows.count,
         }
     
     def _calculate_correlation(self, prices_a: List[float], prices_b: List[float]) -> float:
         """Calculate Pearson correlation coefficient."""
-        n = min(len(prices_a), len(prices_b))
-        if n < 2:
-            return 0.0
-        
-        prices_a = prices_a[-n:]
-        prices_b = prices_b[-n:]
-        
-        # Calculate means
-        mean_a = sum(prices_a) / n
-        mean_b = sum(prices_b) / n
-        
-        # Calculate correlation
-        numerator = sum((prices_a[i] - mean_a) * (prices_b[i] - mean_b) for i in range(n))
-        
-        sum_sq_a = sum((prices_a[i] - mean_a) ** 2 for i in range(n))
-        sum_sq_b = sum((prices_b[i] - mean_b) ** 2 for i in range(n))
-        
-        denominator = (sum_sq_a * sum_sq_b) ** 0.5
-        
-        if denominator == 0:
-            return 0.0
-        
-        return numerator / denominator
+        return _correlation(prices_a, prices_b)
     
     def _calculate_spread(self, prices_a: List[float], prices_b: List[float]) -> List[float]:
         """Calculate price spread between two assets."""
-        n = min(len(prices_a), len(prices_b))
-        return [prices_a[i] - prices_b[i] for i in range(n)]
+        return list(map(sub, prices_a, prices_b))
     
     def _calculate_z_score(self, spread: List[float]) -> float:
         """Calculate z-score of current spread."""
-        if len(spread) < 2:
-            return 0.0
-        
-        mean = sum(spread) / len(spread)
-        variance = sum((x - mean) ** 2 for x in spread) / len(spread)
-        std_dev = variance ** 0.5
-        
-        if std_dev == 0:
-            return 0.0
-        
-        current_spread = spread[-1]
-        z_score = (current_spread - mean) / std_dev
-        
-        return z_score
+        return _z_score(spread)
     
     def _calculate_mean_reversion_score(self, z_score: float, correlation: float) -> float:
         """Calculate mean reversion opportunity score."""
         # Z-score component (weight: 60%)
-        z_score_component = min(abs(z_score) / 3.0, 1.0) * 60
+        z_strength = abs(z_score) / 3.0
+        z_score_component = (1.0 if 1.0 < z_strength else z_strength) * 60
         
         # Correlation component (weight: 40%)
         correlation_component = abs(correlation) * 40
@@ -224,6 +294,8 @@ class StatisticalArbitrageStrategy(BaseStrategy):
         metrics.update({
             'pairs_analyzed': self.pairs_analyzed,
             'mean_reversion_trades': self.mean_reversion_trades,
+            'pair_cache_hits': self._pair_cache_hits,
+            'pair_cache_misses': self._pair_cache_misses,
         })
         
         return metrics
@@ -28,6 +28,11 @@ class StrategyRegistry:
         """Initialize strategy registry."""
         self.strategies: Dict[str, BaseStrategy] = {}
         self.global_rankings: List[Dict[str, Any]] = []
+        
+        # Membership version plus each strategy's state version at the last
+        # ranking; unchanged keys mean the cached rankings are still current
+        self._version = 0
+        self._rankings_key: Optional[tuple] = None
         logger.info("Strategy Registry initialized")
     
     def register_strategy(self, strategy: BaseStrategy):
@@ -41,6 +46,7 @@ class StrategyRegistry:
             logger.warning(f"Strategy {strategy.name} already registered, replacing...")
         
         self.strategies[strategy.name] = strategy
+        self._version += 1
         logger.info(f"Registered strategy: {strategy.name}")
         
         # Update rankings
@@ -55,6 +61,7 @@ class StrategyRegistry:
         """
         if strategy_name in self.strategies:
             del self.strategies[strategy_name]
+            self._version += 1
             logger.info(f"Unregistered strategy: {strategy_name}")
             self.update_global_rankings()
     
@@ -100,7 +107,7 @@ class StrategyRegistry:
         """
         return [
             strategy for strategy in self.strategies.values()
-            if strategy.rank == StrategyRank.ELITE
+            if strategy.rank is StrategyRank.ELITE
         ]
     
     def update_global_rankings(self):
@@ -112,7 +119,14 @@ class StrategyRegistry:
         2. Win rate
         3. Profit factor
         4. Total trades (for consistency)
+        
+        Rankings are rebuilt only when a strategy was registered, unregistered,
+        or recorded a trade since the last update.
         """
+        key = (self._version, tuple(s._state_version for s in self.strategies.values()))
+        if key == self._rankings_key:
+            return
+        
         # Get ranking data for all strategies
         rankings = []
         
@@ -131,6 +145,7 @@ class StrategyRegistry:
             ranking['global_position'] = i + 1
         
         self.global_rankings = rankings
+        self._rankings_key = key
         
         logger.info(f"Updated global rankings for {len(rankings)} strategies")
     
@@ -181,6 +196,40 @@ class StrategyRegistry:
             if strategy.rank == rank
         ]
     
+    def _summary_totals(self) -> Dict[str, Any]:
+        """Aggregate tier counts and trade totals across all strategies in one sweep."""
+        production_ready = 0
+        elite_strategies = 0
+        total_trades = 0
+        total_profit = 0
+        total_loss = 0
+        winning_trades = 0
+        
+        for strategy in self.strategies.values():
+            if strategy.is_production_ready():
+                production_ready += 1
+            if strategy.rank is StrategyRank.ELITE:
+                elite_strategies += 1
+            total_trades += strategy.total_trades
+            total_profit += strategy.total_profit
+            total_loss += strategy.total_loss
+            winning_trades += strategy.winning_trades
+        
+        overall_win_rate = 0.0
+        if total_trades > 0:
+            overall_win_rate = winning_trades / total_trades
+        
+        return {
+            'total_strategies': len(self.strategies),
+            'production_ready': production_ready,
+            'elite_strategies': elite_strategies,
+            'total_trades': total_trades,
+            'total_profit': total_profit,
+            'total_loss': total_loss,
+            'net_profit': total_profit - total_loss,
+            'overall_win_rate': overall_win_rate,
+        }
+    
     def get_performance_report(self) -> Dict[str, Any]:
         """
         Get comprehensive performance report for all strategies.
@@ -190,21 +239,6 @@ class StrategyRegistry:
         """
         self.update_global_rankings()
         
-        # Aggregate statistics
-        total_strategies = len(self.strategies)
-        production_ready = len(self.get_production_ready_strategies())
-        elite_strategies = len(self.get_elite_strategies())
-        
-        # Calculate aggregate performance
-        total_trades = sum(s.total_trades for s in self.strategies.values())
-        total_profit = sum(s.total_profit for s in self.strategies.values())
-        total_loss = sum(s.total_loss for s in self.strategies.values())
-        
-        overall_win_rate = 0.0
-        if total_trades > 0:
-            winning_trades = sum(s.winning_trades for s in self.strategies.values())
-            overall_win_rate = winning_trades / total_trades
-        
         # Get individual strategy metrics
         strategy_metrics = [
             strategy.get_performance_metrics()
@@ -212,16 +246,7 @@ class StrategyRegistry:
         ]
         
         return {
-            'summary': {
-                'total_strategies': total_strategies,
-                'production_ready': production_ready,
-                'elite_strategies': elite_strategies,
-                'total_trades': total_trades,
-                'total_profit': total_profit,
-                'total_loss': total_loss,
-                'net_profit': total_profit - total_loss,
-                'overall_win_rate': overall_win_rate,
-            },
+            'summary': self._summary_totals(),
             'global_rankings': self.global_rankings,
             'strategy_metrics': strategy_metrics,
         }
@@ -230,28 +255,35 @@ class StrategyRegistry:
         """Display global rankings in readable format."""
         self.update_global_rankings()
         
-        print("\n" + "=" * 80)
-        print("MEGA DEFI - GLOBAL STRATEGY RANKINGS")
-        print("=" * 80)
+        # The report is assembled line by line and written with a single print
+        lines = [
+            "\n" + "=" * 80,
+            "MEGA DEFI - GLOBAL STRATEGY RANKINGS",
+            "=" * 80,
+        ]
         
         if not self.global_rankings:
-            print("No strategies registered yet.")
+            lines.append("No strategies registered yet.")
+            print("\n".join(lines))
             return
         
-        print(f"\nTotal Strategies: {len(self.strategies)}")
-        print(f"Production Ready: {len(self.get_production_ready_strategies())}")
-        print(f"Elite Tier: {len(self.get_elite_strategies())}")
+        # Only the summary totals are shown, not the per-strategy metrics
+        summary = self._summary_totals()
         
-        print("\n" + "-" * 80)
-        print(f"{'Rank':<6} {'Strategy':<30} {'Tier':<15} {'Score':<8} {'Win%':<8} {'PF':<8}")
-        print("-" * 80)
+        lines.extend((
+            f"\nTotal Strategies: {summary['total_strategies']}",
+            f"Production Ready: {summary['production_ready']}",
+            f"Elite Tier: {summary['elite_strategies']}",
+            "\n" + "-" * 80,
+            f"{'Rank':<6} {'Strategy':<30} {'Tier':<15} {'Score':<8} {'Win%':<8} {'PF':<8}",
+            "-" * 80,
+        ))
         
         for ranking in self.global_rankings:
-            strategy = self.strategies.get(ranking['strategy'])
-            if not strategy:
+            if ranking['strategy'] not in self.strategies:
                 continue
             
-            print(
+            lines.append(
                 f"{ranking['global_position']:<6} "
                 f"{ranking['strategy']:<30} "
                 f"{ranking['rank']:<15} "
@@ -260,20 +292,18 @@ class StrategyRegistry:
                 f"{ranking['profit_factor']:<8.2f}"
             )
         
-        print("-" * 80)
-        
-        # Summary statistics
-        report = self.get_performance_report()
-        summary = report['summary']
-        
-        print(f"\n📊 AGGREGATE PERFORMANCE:")
-        print(f"   Total Trades: {summary['total_trades']}")
-        print(f"   Net Profit: ${summary['net_profit']:.2f}")
-        print(f"   Overall Win Rate: {summary['overall_win_rate']*100:.1f}%")
-        
-        print("\n" + "=" * 80)
-        print("STATUS: ELITE PRODUCTION OPERATIONS READY ✓")
-        print("=" * 80 + "\n")
+        lines.extend((
+            "-" * 80,
+            f"\n📊 AGGREGATE PERFORMANCE:",
+            f"   Total Trades: {summary['total_trades']}",
+            f"   Net Profit: ${summary['net_profit']:.2f}",
+            f"   Overall Win Rate: {summary['overall_win_rate']*100:.1f}%",
+            "\n" + "=" * 80,
+            "STATUS: ELITE PRODUCTION OPERATIONS READY ✓",
+            "=" * 80 + "\n",
+        ))
+        
+        print("\n".join(lines))
     
     def select_best_strategy(self, 
                             market_conditions: Dict[str, Any] = None) -> Optional[BaseStrategy]:
@@ -286,26 +316,27 @@ class StrategyRegistry:
         Returns:
             Best strategy or None
         """
-        production_ready = self.get_production_ready_strategies()
-        
-        if not production_ready:
-            logger.warning("No production-ready strategies available")
-            return None
-        
-        # If no market conditions specified, return top-ranked strategy
-        if not market_conditions:
-            top_strategies = self.get_top_strategies(1)
-            return top_strategies[0] if top_strategies else None
-        
-        # TODO: Implement market condition-based selection
-        # For now, return top-ranked production-ready strategy
         self.update_global_rankings()
         
+        # One walk down the rankings finds both the top-ranked strategy and
+        # the first production-ready one
+        top_strategy = None
         for ranking in self.global_rankings:
             strategy = self.strategies.get(ranking['strategy'])
-            if strategy and strategy.is_production_ready():
+            if strategy is None:
+                continue
+            if top_strategy is None:
+                top_strategy = strategy
+            if strategy.is_production_ready():
+                # If no market conditions specified, return top-ranked strategy
+                if not market_conditions:
+                    return top_strategy
+                
+                # TODO: Implement market condition-based selection
+                # For now, return top-ranked production-ready strategy
                 return strategy
         
+        logger.warning("No production-ready strategies available")
         return None
     
     def __len__(self):
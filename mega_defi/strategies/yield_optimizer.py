@@ -6,14 +6,41 @@ Advanced yield farming optimization strategy.
 Targets 30-150% APY by dynamically allocating capital to highest-yield opportunities.
 """
 
-from typing import Dict, Any, List
-from .base_strategy import BaseStrategy
+from typing import Dict, Any, List, Optional
+from .base_strategy import BaseStrategy, _TopRows
 from ..config import Config
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _risk_adjusted_yield(apy: float, risk_score: float, tvl: float) -> float:
+    """Risk-Adjusted APY = APY x (1 - 0.7 x Risk_Score) x TVL_Factor."""
+    # TVL factor (larger TVL = safer)
+    tvl_factor = tvl / 100000000
+    tvl_factor = 1.2 if 1.2 < tvl_factor else tvl_factor  # Cap at 1.2x for $100M+ TVL
+    
+    # Risk adjustment
+    risk_adjustment = 1 - (risk_score * 0.7)  # Max 70% reduction for high risk
+    
+    return apy * risk_adjustment * tvl_factor
+
+
+def _opportunity_score(risk_adjusted_apy: float, tvl: float, risk_score: float) -> float:
+    """Weighted yield (60%), safety (25%) and liquidity (15%) score."""
+    # APY component (weight: 60%)
+    apy_score = risk_adjusted_apy * 60
+    
+    # Safety component (weight: 25%)
+    safety_score = (1 - risk_score) * 25
+    
+    # Liquidity component (weight: 15%)
+    liquidity_factor = tvl / 10000000
+    liquidity_score = (1.0 if 1.0 < liquidity_factor else liquidity_factor) * 15
+    
+    return apy_score + safety_score + liquidity_score
+
+
 class YieldOptimizerStrategy(BaseStrategy):
     """
     Yield farming optimizer with dynamic allocation.
@@ -50,12 +77,13 @@ class YieldOptimizerStrategy(BaseStrategy):
         self.rebalances_executed = 0
         self.total_yield_earned = 0.0
     
-    def analyze(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze(self, market_data: Dict[str, Any], top_k: Optional[int] = None) -> Dict[str, Any]:
         """
         Analyze yield farming opportunities.
         
         Args:
             market_data: Market data with protocol yields
+            top_k: Return only the best top_k opportunities (default: all)
             
         Returns:
             Analysis with yield opportunities
@@ -68,27 +96,31 @@ class YieldOptimizerStrategy(BaseStrategy):
         
         self.protocols_monitored += len(protocols)
         
-        opportunities = []
+        rows = _TopRows(top_k)
+        
+        # Per-scan constants, bound once instead of per protocol
+        min_apy = self.min_apy
+        max_protocol_risk = self.max_protocol_risk
         
         for protocol in protocols:
-            protocol_name = protocol.get('name')
-            apy = protocol.get('apy', 0)
-            tvl = protocol.get('tvl', 0)
-            risk_score = protocol.get('risk_score', 0.5)
+            get = protocol.get
+            apy = get('apy', 0)
+            risk_score = get('risk_score', 0.5)
             
             # Filter by minimum requirements
-            if apy < self.min_apy or risk_score > self.max_protocol_risk:
+            if apy < min_apy or risk_score > max_protocol_risk:
                 continue
             
-            # Calculate risk-adjusted yield
-            risk_adjusted_apy = self._calculate_risk_adjusted_yield(apy, risk_score, tvl)
-            
-            # Calculate opportunity score
-            opportunity_score = self._calculate_opportunity_score(
-                risk_adjusted_apy, tvl, risk_score
-            )
-            
-            opportunities.append({
+            tvl = get('tvl', 0)
+            risk_adjusted_apy = _risk_adjusted_yield(apy, risk_score, tvl)
+            rows.add((
+                _opportunity_score(risk_adjusted_apy, tvl, risk_score),
+                get('name'), apy, risk_adjusted_apy, tvl, risk_score,
+            ))
+        
+        # Ranked by opportunity score; dicts are built only for kept rows
+        opportunities = [
+            {
                 'protocol': protocol_name,
                 'apy': apy,
                 'risk_adjusted_apy': risk_adjusted_apy,
@@ -96,15 +128,15 @@ class YieldOptimizerStrategy(BaseStrategy):
                 'risk_score': risk_score,
                 'opportunity_score': opportunity_score,
                 'current_allocation': current_allocation.get(protocol_name, 0),
-            })
-        
-        # Sort by opportunity score
-        opportunities.sort(key=lambda x: x['opportunity_score'], reverse=True)
+            }
+            for (opportunity_score, protocol_name, apy,
+                 risk_adjusted_apy, tvl, risk_score) in rows.best()
+        ]
         
         return {
             'opportunities': opportunities,
             'best_opportunity': opportunities[0] if opportunities else None,
-            'total_opportunities': len(opportunities),
+            'total_opportunities': rows.count,
         }
     
     def _calculate_risk_adjusted_yield(self,
@@ -124,15 +156,7 @@ class YieldOptimizerStrategy(BaseStrategy):
         Returns:
             Risk-adjusted APY
         """
-        # TVL factor (larger TVL = safer)
-        tvl_factor = min(tvl / 100000000, 1.2)  # Cap at 1.2x for $100M+ TVL
-        
-        # Risk adjustment
-        risk_adjustment = 1 - (risk_score * 0.7)  # Max 70% reduction for high risk
-        
-        risk_adjusted = apy * risk_adjustment * tvl_factor
-        
-        return risk_adjusted
+        return _risk_adjusted_yield(apy, risk_score, tvl)
     
     def _calculate_opportunity_score(self,
                                      risk_adjusted_apy: float,
@@ -149,16 +173,7 @@ class YieldOptimizerStrategy(BaseStrategy):
         Returns:
             Opportunity score (higher is better)
         """
-        # APY component (weight: 60%)
-        apy_score = risk_adjusted_apy * 60
-        
-        # Safety component (weight: 25%)
-        safety_score = (1 - risk_score) * 25
-        
-        # Liquidity component (weight: 15%)
-        liquidity_score = min(tvl / 10000000, 1.0) * 15
-        
-        return apy_score + safety_score + liquidity_score
+        return _opportunity_score(risk_adjusted_apy, tvl, risk_score)
     
     def generate_signal(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Generate yield optimization signal."""
@@ -11,6 +11,11 @@ from mega_defi.ml import (
 )
 
 
+def _sum_fitness(params):
+    """Module-level fitness function so it can be pickled to worker processes."""
+    return sum(params.values())
+
+
 class TestReinforcementLearningOptimizer(unittest.TestCase):
     """Test cases for Reinforcement Learning Optimizer."""
     
@@ -99,6 +104,20 @@ class TestReinforcementLearningOptimizer(unittest.TestCase):
         self.assertIn('training_steps', metrics)
         self.assertIn('exploration_rate', metrics)
 
+    def test_episode_history_is_bounded(self):
+        """Test reward history is capped while aggregates cover every episode."""
+        optimizer = ReinforcementLearningOptimizer(max_episode_history=50)
+        rewards = [float(i) for i in range(200)]
+        for reward in rewards:
+            optimizer._record_episode_reward(reward)
+
+        metrics = optimizer.get_performance_metrics()
+
+        self.assertEqual(len(optimizer.episode_rewards), 50)
+        self.assertEqual(metrics['total_episodes'], 200)
+        self.assertAlmostEqual(metrics['average_reward'], sum(rewards) / 200)
+        self.assertAlmostEqual(metrics['recent_average'], sum(rewards[-100:]) / 100)
+
 
 class TestDeepLearningPredictor(unittest.TestCase):
     """Test cases for Deep Learning Predictor."""
@@ -239,6 +258,43 @@ class TestGeneticAlgorithmTuner(unittest.TestCase):
         self.assertIn('best_parameters', report)
         self.assertIn('generations_run', report)
 
+    def test_early_stopping_on_plateau(self):
+        """Test optimization stops once best fitness stops improving."""
+        tuner = GeneticAlgorithmTuner(
+            population_size=10,
+            max_generations=100,
+            patience=3
+        )
+
+        # Constant fitness never improves after the first generation
+        tuner.optimize({'param1': (0.0, 1.0)}, lambda params: 1.0)
+
+        self.assertEqual(len(tuner.fitness_history), 4)
+
+    def test_parallel_fitness_evaluation(self):
+        """Test optimization with fitness evaluated in worker processes."""
+        tuner = GeneticAlgorithmTuner(
+            population_size=8,
+            max_generations=3,
+            n_workers=2
+        )
+
+        best_params = tuner.optimize({'param1': (0.0, 1.0), 'param2': (0.0, 1.0)}, _sum_fitness)
+
+        self.assertIn('param1', best_params)
+        self.assertEqual(tuner.best_fitness, _sum_fitness(best_params))
+
+    def test_seeded_runs_are_reproducible(self):
+        """Test tuners with the same seed produce identical results."""
+        parameter_space = {'param1': (0.0, 1.0), 'param2': (1, 10)}
+        results = [
+            GeneticAlgorithmTuner(population_size=10, max_generations=5, seed=42)
+            .optimize(parameter_space, _sum_fitness)
+            for _ in range(2)
+        ]
+
+        self.assertEqual(results[0], results[1])
+
 
 class TestEnsembleModel(unittest.TestCase):
     """Test cases for Ensemble Model."""
@@ -1,5 +1,6 @@
 """Comprehensive integration tests for Profit Machine."""
 
+import asyncio
 import unittest
 from mega_defi.profit_machine import ProfitMachine, create_profit_machine
 from mega_defi.core.strategy_engine import StrategyType, Signal
@@ -83,6 +84,50 @@ class TestProfitMachine(unittest.TestCase):
         arbitrage_ops = [op for op in opportunities if op['type'] == 'arbitrage']
         self.assertGreater(len(arbitrage_ops), 0)
     
+    def test_process_market_data_batch(self):
+        """Test batch processing returns one recommendation per tick in order."""
+        batch = [
+            {'price': 100.0 + i, 'volume': 1000000, 'liquidity': 5000000, 'fee_rate': 0.003}
+            for i in range(5)
+        ]
+        
+        recommendations = self.machine.process_market_data_batch(batch)
+        
+        self.assertEqual(len(recommendations), 5)
+        self.assertEqual(
+            [rec['market_analysis']['price'] for rec in recommendations],
+            [tick['price'] for tick in batch]
+        )
+        self.assertEqual(len(self.machine.market_analyzer.price_history), 5)
+    
+    def test_process_market_data_stream_is_lazy(self):
+        """Test streamed ticks are analyzed only as results are consumed."""
+        ticks = ({'price': 100.0 + i, 'liquidity': 5000000} for i in range(3))
+        
+        stream = self.machine.process_market_data_stream(ticks)
+        self.assertEqual(len(self.machine.market_analyzer.price_history), 0)
+        
+        first = next(stream)
+        self.assertEqual(first['market_analysis']['price'], 100.0)
+        self.assertEqual(len(self.machine.market_analyzer.price_history), 1)
+        self.assertEqual(len(list(stream)), 2)
+    
+    def test_process_market_data_async(self):
+        """Test async processing runs the full pipeline for each awaited tick."""
+        ticks = [{'price': 100.0 + i, 'liquidity': 5000000} for i in range(3)]
+        
+        async def run():
+            recommendations = []
+            for tick in ticks:
+                recommendations.append(await self.machine.process_market_data_async(tick))
+            return recommendations
+        
+        recommendations = asyncio.run(run())
+        
+        self.assertEqual([rec['market_analysis']['price'] for rec in recommendations],
+                         [tick['price'] for tick in ticks])
+        self.assertEqual(len(self.machine.market_analyzer.price_history), 3)
+    
     def test_execute_approved_trade(self):
         """Test executing an approved trade."""
         # Create market data that should generate approved trade
@@ -121,6 +166,46 @@ class TestProfitMachine(unittest.TestCase):
         self.assertFalse(result['executed'])
         self.assertIn('reason', result)
     
+    def test_process_market_data_without_capacity(self):
+        """Test saturated risk limits short-circuit the pipeline."""
+        market_data = {
+            'price': 100.0,
+            'volume': 1000000,
+            'liquidity': 5000000
+        }
+        normal = self.machine.process_market_data(market_data)
+        
+        self.machine.risk_manager.open_position('full', {'size': 0.8})
+        recommendation = self.machine.process_market_data(market_data)
+        
+        self.assertFalse(recommendation['approved'])
+        self.assertEqual(recommendation['risk_assessment']['reason'], 'no_capacity')
+        self.assertEqual(recommendation['signal'], 'hold')
+        self.assertIsNone(recommendation['strategy'])
+        self.assertEqual(recommendation['risk_assessment']['risk_level'], 'high')
+        self.assertIn('market_analysis', recommendation)
+        
+        # Callers see the same keys whether or not the book is full
+        self.assertEqual(recommendation.keys(), normal.keys())
+        self.assertLessEqual(normal['risk_assessment'].keys(),
+                             recommendation['risk_assessment'].keys())
+    
+    def test_identical_trades_get_distinct_position_ids(self):
+        """Test repeated trades at the same price open separate positions."""
+        recommendation = {
+            'approved': True,
+            'signal': 'buy',
+            'strategy': 'arbitrage',
+            'risk_assessment': {'position_size': 0.01, 'stop_loss': 0.02, 'take_profit': 0.06},
+            'optimization': {'entry_price': 100.0}
+        }
+        
+        first = self.machine.execute_trade(recommendation)
+        second = self.machine.execute_trade(recommendation)
+        
+        self.assertNotEqual(first['position_id'], second['position_id'])
+        self.assertEqual(len(self.machine.risk_manager.active_positions), 2)
+    
     def test_trade_lifecycle(self):
         """Test complete trade lifecycle: process -> execute -> close."""
         market_data = {
@@ -79,6 +79,33 @@ class TestRiskManager(unittest.TestCase):
         self.risk_manager.close_position('pos1')
         self.assertAlmostEqual(self.risk_manager.total_exposure, 0.2)
     
+    def test_has_capacity(self):
+        """Test capacity check tracks open exposure."""
+        self.assertTrue(self.risk_manager.has_capacity())
+        
+        self.risk_manager.open_position('pos1', {'size': 0.8})
+        self.assertFalse(self.risk_manager.has_capacity())
+        
+        self.risk_manager.close_position('pos1')
+        self.assertTrue(self.risk_manager.has_capacity())
+    
+    def test_mark_to_market(self):
+        """Test unrealized PnL across open positions and slot reuse."""
+        self.risk_manager.open_position('long', {'size': 0.1, 'entry_price': 100.0, 'signal': 'buy'})
+        self.risk_manager.open_position('short', {'size': 0.2, 'entry_price': 100.0, 'signal': 'sell'})
+        self.risk_manager.open_position('flat', {'size': 0.05})
+        
+        pnl = self.risk_manager.mark_to_market(110.0)
+        self.assertAlmostEqual(pnl['long'], 0.01)
+        self.assertAlmostEqual(pnl['short'], -0.02)
+        self.assertEqual(pnl['flat'], 0.0)
+        
+        self.risk_manager.close_position('long')
+        self.risk_manager.open_position('next', {'size': 0.1, 'entry_price': 110.0, 'signal': 'buy'})
+        pnl = self.risk_manager.mark_to_market(110.0)
+        self.assertEqual(set(pnl), {'short', 'flat', 'next'})
+        self.assertEqual(pnl['next'], 0.0)
+    
     def test_portfolio_status(self):
         """Test portfolio status reporting."""
         self.risk_manager.update_portfolio(10000)
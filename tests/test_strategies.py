@@ -1,5 +1,11 @@
 """Tests for Advanced Production Strategies."""
 
+import asyncio
+import contextlib
+import copy
+import io
+import pickle
+import threading
 import unittest
 from mega_defi.strategies import (
     BaseStrategy,
@@ -69,6 +75,76 @@ class TestBaseStrategy(unittest.TestCase):
         # Should be upgraded to higher rank
         self.assertIn(strategy.rank, [StrategyRank.PROFESSIONAL, StrategyRank.ADVANCED, StrategyRank.ELITE])
     
+    def test_rank_all_matches_individual_ranking(self):
+        """Test batch ranking agrees with per-strategy ranking."""
+        strategies = [FlashLoanArbitrageStrategy(), CrossChainArbitrageStrategy(), MEVStrategy()]
+        for i, strategy in enumerate(strategies):
+            for _ in range(4 + 6 * i):
+                strategy.record_trade(0.05, True)
+            strategy.record_trade(-0.01, False)
+        
+        expected = [(s.global_rank_score, s.rank) for s in strategies]
+        scores = BaseStrategy.rank_all(strategies)
+        
+        self.assertEqual(scores, [score for score, _ in expected])
+        self.assertEqual([(s.global_rank_score, s.rank) for s in strategies], expected)
+    
+    def test_running_sharpe_and_drawdown(self):
+        """Test running Sharpe ratio and max drawdown match a full recompute."""
+        strategy = MEVStrategy()
+        trades = [(0.05, True), (0.03, False), (0.02, False), (0.04, True), (0.01, True)]
+        for profit, success in trades:
+            strategy.record_trade(profit, success)
+        
+        returns = [p if ok else -p for p, ok in trades]
+        mean = sum(returns) / len(returns)
+        std = (sum((r - mean) ** 2 for r in returns) / (len(returns) - 1)) ** 0.5
+        self.assertAlmostEqual(strategy.sharpe_ratio, mean / std)
+        self.assertAlmostEqual(strategy.max_drawdown, 0.05)
+    
+    def test_record_win_and_loss_match_record_trade(self):
+        """Test specialized win/loss recording matches record_trade."""
+        generic = MEVStrategy()
+        specialized = MEVStrategy()
+        for _ in range(6):
+            generic.record_trade(0.04, True)
+            specialized.record_win(0.04)
+        generic.record_trade(-0.02, False)
+        specialized.record_loss(0.02)
+        
+        self.assertEqual(generic.get_performance_metrics(), specialized.get_performance_metrics())
+    
+    def test_concurrent_trade_recording(self):
+        """Test trades recorded from several threads are all counted."""
+        strategy = MEVStrategy()
+        
+        def record():
+            for _ in range(250):
+                strategy.record_win(0.01)
+        
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(strategy.total_trades, 1000)
+        self.assertEqual(strategy.winning_trades, 1000)
+        self.assertAlmostEqual(strategy.total_profit, 10.0)
+    
+    def test_performance_metrics_cache(self):
+        """Test cached metrics refresh on trades and are safe to mutate."""
+        strategy = FlashLoanArbitrageStrategy()
+        metrics = strategy.get_performance_metrics()
+        metrics['total_trades'] = 99
+        self.assertEqual(strategy.get_performance_metrics()['total_trades'], 0)
+        
+        strategy.record_trade(0.05, True)
+        self.assertEqual(strategy.get_performance_metrics()['total_trades'], 1)
+        
+        strategy.enabled = False
+        self.assertFalse(strategy.get_performance_metrics()['enabled'])
+    
     def test_production_ready_criteria(self):
         """Test production ready check."""
         strategy = CrossChainArbitrageStrategy()
@@ -82,6 +158,31 @@ class TestBaseStrategy(unittest.TestCase):
         
         # Should be production ready
         self.assertTrue(strategy.is_production_ready())
+    
+    def test_pickle_and_deepcopy_round_trip(self):
+        """Test strategies survive pickling and deep copies with a working lock."""
+        strategies = [
+            FlashLoanArbitrageStrategy(),
+            CrossChainArbitrageStrategy(),
+            LiquidationHunterStrategy(),
+            MEVStrategy(),
+            StatisticalArbitrageStrategy(),
+            YieldOptimizerStrategy(),
+        ]
+        
+        for strategy in strategies:
+            strategy.record_trade(0.05, True)
+            strategy.record_trade(-0.01, False)
+            
+            for clone in (pickle.loads(pickle.dumps(strategy)), copy.deepcopy(strategy)):
+                with self.subTest(strategy=strategy.name):
+                    self.assertEqual(clone.get_performance_metrics(),
+                                     strategy.get_performance_metrics())
+                    self.assertIsNot(clone._lock, strategy._lock)
+                    
+                    clone.record_trade(0.02, True)
+                    self.assertEqual(clone.total_trades, 3)
+                    self.assertEqual(strategy.total_trades, 2)
 
 
 class TestFlashLoanArbitrageStrategy(unittest.TestCase):
@@ -128,6 +229,63 @@ class TestFlashLoanArbitrageStrategy(unittest.TestCase):
             self.assertEqual(signal['action'], 'EXECUTE_ARBITRAGE')
             self.assertGreater(signal['confidence'], 0)
     
+    def test_gas_cost_uses_market_eth_price(self):
+        """Test gas cost estimate follows a supplied ETH price."""
+        strategy = FlashLoanArbitrageStrategy(min_profit_threshold=0.01)
+        market_data = {
+            'exchanges': [
+                {'name': 'Uniswap', 'price': 100, 'liquidity': 500000},
+                {'name': 'SushiSwap', 'price': 105, 'liquidity': 600000},
+            ],
+            'gas_price': 50,
+        }
+        
+        default_cost = strategy.analyze(market_data)['best_opportunity']['estimated_gas_cost']
+        market_data['eth_price'] = 4000
+        market_cost = strategy.analyze(market_data)['best_opportunity']['estimated_gas_cost']
+        
+        self.assertAlmostEqual(default_cost, 40.0)
+        self.assertAlmostEqual(market_cost, 80.0)
+    
+    def test_repeated_snapshot_reuses_scan(self):
+        """Test a repeated snapshot returns equal, independent results."""
+        strategy = FlashLoanArbitrageStrategy(min_profit_threshold=0.01)
+        market_data = {
+            'exchanges': [
+                {'name': 'Uniswap', 'price': 100, 'liquidity': 500000},
+                {'name': 'SushiSwap', 'price': 105, 'liquidity': 600000},
+            ],
+            'gas_price': 50,
+        }
+        
+        first = strategy.analyze(market_data)
+        first['best_opportunity']['tar_score'] = -1
+        second = strategy.analyze(market_data)
+        
+        self.assertGreater(second['best_opportunity']['tar_score'], 0)
+        self.assertEqual(strategy.opportunities_found, 2)
+        
+        market_data['exchanges'][1]['price'] = 110
+        third = strategy.analyze(market_data)
+        self.assertEqual(third['best_opportunity']['sell_price'], 110)
+    
+    def test_gather_exchange_data(self):
+        """Test concurrent exchange fetches are shaped for analyze."""
+        strategy = FlashLoanArbitrageStrategy(min_profit_threshold=0.01)
+        
+        async def quote(price):
+            await asyncio.sleep(0)
+            return {'price': price, 'liquidity': 500000}
+        
+        market_data = asyncio.run(strategy.gather_exchange_data({
+            'Uniswap': lambda: quote(100),
+            'SushiSwap': lambda: quote(105),
+        }))
+        
+        names = [exchange['name'] for exchange in market_data['exchanges']]
+        self.assertEqual(names, ['Uniswap', 'SushiSwap'])
+        self.assertIsNotNone(strategy.analyze(market_data)['best_opportunity'])
+    
     def test_tar_score_calculation(self):
         """Test TAR (Total Arbitrage Return) score."""
         strategy = FlashLoanArbitrageStrategy()
@@ -165,6 +323,56 @@ class TestCrossChainArbitrageStrategy(unittest.TestCase):
             self.assertIn('sell_chain', opp)
             self.assertIn('net_profit', opp)
     
+    def test_gather_chain_data(self):
+        """Test concurrent chain fetches feed analyze and skip failures."""
+        strategy = CrossChainArbitrageStrategy()
+        
+        async def quote(price):
+            await asyncio.sleep(0)
+            return {'price': price, 'liquidity': 100000}
+        
+        async def failing():
+            raise ConnectionError("rpc down")
+        
+        market_data = asyncio.run(strategy.gather_chain_data({
+            'Ethereum': lambda: quote(100),
+            'BSC': lambda: quote(105),
+            'Polygon': failing,
+        }))
+        
+        self.assertEqual(set(market_data['chains']), {'Ethereum', 'BSC'})
+        self.assertIn('opportunities', strategy.analyze(market_data))
+    
+    def test_gather_chain_data_propagates_cancellation(self):
+        """Test a cancelled chain fetch is re-raised rather than skipped."""
+        strategy = CrossChainArbitrageStrategy()
+        
+        async def quote(price):
+            return {'price': price, 'liquidity': 100000}
+        
+        async def cancelled():
+            raise asyncio.CancelledError()
+        
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(strategy.gather_chain_data({
+                'Ethereum': lambda: quote(100),
+                'BSC': cancelled,
+            }))
+    
+    def test_position_size_tracks_max_bridge_time(self):
+        """Test time-adjusted sizing follows changes to max_bridge_time."""
+        strategy = CrossChainArbitrageStrategy(max_bridge_time=600)
+        signal = {'action': 'BUY', 'expected_profit': 0.1, 'bridge_time': 300, 'liquidity': 1e9}
+        risk_params = {'max_position_size': 1.0}
+        
+        self.assertAlmostEqual(strategy.calculate_position_size(signal, 1000, risk_params), 0.225)
+        
+        strategy.max_bridge_time = 300
+        self.assertAlmostEqual(strategy.calculate_position_size(signal, 1000, risk_params), 0.15)
+        
+        strategy = CrossChainArbitrageStrategy(max_bridge_time=0)
+        self.assertAlmostEqual(strategy.calculate_position_size(signal, 1000, risk_params), 0.3)
+    
     def test_bridge_fee_calculation(self):
         """Test bridge fee lookup."""
         strategy = CrossChainArbitrageStrategy()
@@ -172,6 +380,48 @@ class TestCrossChainArbitrageStrategy(unittest.TestCase):
         fee = strategy._get_bridge_fee('Ethereum', 'BSC')
         self.assertGreater(fee, 0)
         self.assertLess(fee, 0.01)  # Should be less than 1%
+    
+    def test_bridge_fee_updates_apply_to_analysis(self):
+        """Test editing or replacing bridge_fees reprices cached and future scans."""
+        strategy = CrossChainArbitrageStrategy(min_profit_after_fees=0.001, max_bridge_time=900)
+        market_data = {
+            'chains': {
+                'Ethereum': {'price': 100, 'liquidity': 100000},
+                'BSC': {'price': 105, 'liquidity': 80000},
+            }
+        }
+        
+        before = strategy.analyze(market_data)['best_opportunity']
+        self.assertEqual(before['bridge_fee'], 0.001)
+        
+        strategy.bridge_fees[('Ethereum', 'BSC')] = 0.01
+        after = strategy.analyze(market_data)['best_opportunity']
+        self.assertEqual(after['bridge_fee'], 0.01)
+        self.assertAlmostEqual(after['net_profit'], before['net_profit'] - 0.009)
+        
+        strategy.bridge_fees = {('Ethereum', 'BSC'): 0.002}
+        self.assertEqual(strategy.analyze(market_data)['best_opportunity']['bridge_fee'], 0.002)
+    
+    def test_supported_chain_updates_apply_to_analysis(self):
+        """Test editing or replacing supported_chains changes which chains are scanned."""
+        strategy = CrossChainArbitrageStrategy(min_profit_after_fees=0.001, max_bridge_time=900,
+                                               supported_chains=['Ethereum', 'BSC'])
+        market_data = {
+            'chains': {
+                'Ethereum': {'price': 100, 'liquidity': 100000},
+                'BSC': {'price': 105, 'liquidity': 80000},
+                'Fantom': {'price': 110, 'liquidity': 90000},
+            }
+        }
+        
+        self.assertEqual(strategy.analyze(market_data)['total_opportunities'], 1)
+        
+        strategy.supported_chains.append('Fantom')
+        self.assertEqual(strategy.analyze(market_data)['total_opportunities'], 3)
+        
+        strategy.supported_chains = ['Ethereum', 'Fantom']
+        best = strategy.analyze(market_data)['best_opportunity']
+        self.assertEqual((best['buy_chain'], best['sell_chain']), ('Ethereum', 'Fantom'))
 
 
 class TestLiquidationHunterStrategy(unittest.TestCase):
@@ -224,6 +474,17 @@ class TestLiquidationHunterStrategy(unittest.TestCase):
         
         # Health = (10 * 2000 * 0.8) / 15000 = 16000 / 15000 = 1.067
         self.assertAlmostEqual(health_factor, 1.067, places=2)
+    
+    def test_urgency_score_bands(self):
+        """Test urgency score at and around each health factor boundary."""
+        strategy = LiquidationHunterStrategy()
+        
+        expected = [
+            (0.95, 10.0), (1.0, 8.0), (1.005, 8.0), (1.01, 5.0),
+            (1.02, 3.0), (1.03, 1.0), (float('inf'), 1.0),
+        ]
+        for health_factor, score in expected:
+            self.assertEqual(strategy._calculate_urgency_score(health_factor), score)
 
 
 class TestMEVStrategy(unittest.TestCase):
@@ -308,6 +569,55 @@ class TestStatisticalArbitrageStrategy(unittest.TestCase):
         
         z_score = strategy._calculate_z_score(spread)
         self.assertGreater(abs(z_score), 2.0)
+    
+    def test_repeated_history_version_reuses_pair_stats(self):
+        """Test an unchanged history version is served from the pair cache."""
+        strategy = StatisticalArbitrageStrategy(z_score_threshold=1.0, lookback_period=5)
+        market_data = {
+            'asset_pairs': [{'asset_a': 'ETH', 'asset_b': 'WBTC'}],
+            'price_history': {
+                'ETH': [100, 101, 102, 103, 104, 110],
+                'WBTC': [200, 202, 204, 206, 208, 210],
+            },
+            'history_version': 1,
+        }
+        
+        first = strategy.analyze(market_data)
+        second = strategy.analyze(market_data)
+        self.assertIsNotNone(first['best_opportunity'])
+        self.assertEqual(first, second)
+        
+        market_data['price_history']['WBTC'][-1] = 209
+        market_data['history_version'] = 2
+        third = strategy.analyze(market_data)
+        self.assertEqual(third['best_opportunity']['spread'], -99)
+        
+        metrics = strategy.get_performance_metrics()
+        self.assertEqual(metrics['pair_cache_hits'], 1)
+        self.assertEqual(metrics['pair_cache_misses'], 2)
+    
+    def test_unversioned_history_is_always_recomputed(self):
+        """Test snapshots without a history version bypass the pair cache."""
+        strategy = StatisticalArbitrageStrategy(z_score_threshold=1.0, lookback_period=5)
+        
+        def market_data(prices_a, prices_b):
+            return {
+                'asset_pairs': [{'asset_a': 'A', 'asset_b': 'B'}],
+                'price_history': {'A': prices_a, 'B': prices_b},
+            }
+        
+        first = strategy.analyze(market_data([100, 101, 102, 103, 110], [200, 202, 204, 206, 210]))
+        self.assertIsNotNone(first['best_opportunity'])
+        
+        slid = market_data([110, 90, 95, 80, 110], [210, 190, 250, 170, 210])
+        second = strategy.analyze(slid)
+        self.assertEqual(second, StatisticalArbitrageStrategy(
+            z_score_threshold=1.0, lookback_period=5).analyze(slid))
+        self.assertIsNone(second['best_opportunity'])
+        
+        metrics = strategy.get_performance_metrics()
+        self.assertEqual(metrics['pair_cache_hits'], 0)
+        self.assertEqual(metrics['pair_cache_misses'], 0)
 
 
 class TestYieldOptimizerStrategy(unittest.TestCase):
@@ -359,6 +669,83 @@ class TestYieldOptimizerStrategy(unittest.TestCase):
         self.assertGreater(risk_adjusted_high, risk_adjusted_low)
 
 
+class TestAnalyzeTopK(unittest.TestCase):
+    """Test the top_k cap shared by every strategy's analyze()."""
+    
+    @staticmethod
+    def _cases():
+        """Return (strategy, market_data) fixtures with four opportunities each."""
+        stat_arb_history = {'BASE': [200, 202, 204, 206, 208, 210]}
+        for i, last in enumerate([110, 112, 115, 118]):
+            stat_arb_history[f'A{i}'] = [100, 101, 102, 103, 104, last]
+        
+        return [
+            (FlashLoanArbitrageStrategy(min_profit_threshold=0.005), {
+                'exchanges': [
+                    {'name': 'Uniswap', 'price': 100, 'liquidity': 500000},
+                    {'name': 'SushiSwap', 'price': 103, 'liquidity': 600000},
+                    {'name': 'Curve', 'price': 101, 'liquidity': 550000},
+                    {'name': 'Balancer', 'price': 106, 'liquidity': 450000},
+                ],
+                'gas_price': 50,
+            }),
+            (CrossChainArbitrageStrategy(min_profit_after_fees=0.001, max_bridge_time=900), {
+                'chains': {
+                    'Ethereum': {'price': 100, 'liquidity': 100000},
+                    'BSC': {'price': 105, 'liquidity': 80000},
+                    'Polygon': {'price': 102, 'liquidity': 90000},
+                    'Arbitrum': {'price': 108, 'liquidity': 70000},
+                }
+            }),
+            (LiquidationHunterStrategy(min_health_factor=1.2, min_liquidation_profit=0.0), {
+                'lending_positions': [
+                    {'id': f'pos{i}', 'collateral_asset': 'ETH', 'debt_asset': 'USDC',
+                     'collateral_amount': 10, 'debt_amount': debt}
+                    for i, debt in enumerate([15000, 16500, 18000, 19000])
+                ],
+                'asset_prices': {'ETH': 2000, 'USDC': 1},
+                'gas_price': 50,
+            }),
+            (MEVStrategy(min_transaction_size=10000, min_expected_profit=-1.0,
+                         max_slippage_impact=1.0), {
+                'pending_transactions': [
+                    {'hash': f'0x{i}', 'type': 'swap', 'value': value,
+                     'gas_price': 100, 'pool': 'pool1'}
+                    for i, value in enumerate([20000, 50000, 80000, 120000])
+                ],
+                'liquidity_pools': {'pool1': {'reserve_in': 1000000, 'reserve_out': 2000000000}},
+            }),
+            (StatisticalArbitrageStrategy(z_score_threshold=1.0, lookback_period=5), {
+                'asset_pairs': [{'asset_a': f'A{i}', 'asset_b': 'BASE'} for i in range(4)],
+                'price_history': stat_arb_history,
+            }),
+            (YieldOptimizerStrategy(min_apy=0.10), {
+                'yield_protocols': [
+                    {'name': f'Pool {i}', 'apy': apy, 'tvl': 50000000, 'risk_score': 0.2}
+                    for i, apy in enumerate([0.12, 0.30, 0.18, 0.45])
+                ],
+                'current_allocation': {'Pool 1': 0.25},
+            }),
+        ]
+    
+    def test_top_k_keeps_best_opportunities(self):
+        """Test capping keeps the best opportunities and the full survivor count."""
+        for strategy, market_data in self._cases():
+            full = strategy.analyze(market_data)
+            self.assertGreaterEqual(full['total_opportunities'], 3, strategy.name)
+            
+            for top_k in (0, 2, 100):
+                with self.subTest(strategy=strategy.name, top_k=top_k):
+                    capped = strategy.analyze(market_data, top_k=top_k)
+                    
+                    self.assertEqual(capped['opportunities'], full['opportunities'][:top_k])
+                    self.assertEqual(capped['total_opportunities'], full['total_opportunities'])
+                    self.assertEqual(
+                        capped['best_opportunity'],
+                        full['best_opportunity'] if top_k else None
+                    )
+
+
 class TestStrategyRegistry(unittest.TestCase):
     """Test cases for Strategy Registry."""
     
@@ -410,6 +797,27 @@ class TestStrategyRegistry(unittest.TestCase):
         self.assertIn('global_position', rankings[0])
         self.assertIn('score', rankings[0])
     
+    def test_rankings_rebuilt_only_on_change(self):
+        """Test rankings are reused until a strategy records a trade."""
+        registry = StrategyRegistry()
+        flash_loan = FlashLoanArbitrageStrategy()
+        cross_chain = CrossChainArbitrageStrategy()
+        registry.register_strategy(flash_loan)
+        registry.register_strategy(cross_chain)
+        
+        rankings = registry.global_rankings
+        registry.update_global_rankings()
+        self.assertIs(registry.global_rankings, rankings)
+        
+        for _ in range(5):
+            cross_chain.record_trade(0.05, True)
+        registry.update_global_rankings()
+        self.assertIsNot(registry.global_rankings, rankings)
+        self.assertEqual(registry.global_rankings[0]['strategy'], cross_chain.name)
+        
+        registry.unregister_strategy(cross_chain.name)
+        self.assertEqual(len(registry.global_rankings), 1)
+    
     def test_get_top_strategies(self):
         """Test getting top strategies."""
         registry = StrategyRegistry()
@@ -456,6 +864,44 @@ class TestStrategyRegistry(unittest.TestCase):
         self.assertGreater(len(production_ready), 0)
         self.assertTrue(all(s.is_production_ready() for s in production_ready))
     
+    def test_select_best_strategy(self):
+        """Test selection returns the top production-ready strategy."""
+        registry = StrategyRegistry()
+        self.assertIsNone(registry.select_best_strategy())
+        
+        ready = FlashLoanArbitrageStrategy()
+        for _ in range(15):
+            ready.record_trade(0.05, True)
+        not_ready = CrossChainArbitrageStrategy()
+        for _ in range(5):
+            not_ready.record_trade(0.03, True)
+        
+        registry.register_strategy(not_ready)
+        self.assertIsNone(registry.select_best_strategy())
+        
+        registry.register_strategy(ready)
+        self.assertIs(registry.select_best_strategy(), ready)
+        self.assertIs(registry.select_best_strategy({'volatility': 'high'}), ready)
+    
+    def test_display_rankings_summary(self):
+        """Test the displayed aggregate summary matches recorded trades."""
+        registry = StrategyRegistry()
+        flash_loan = FlashLoanArbitrageStrategy()
+        flash_loan.record_trade(0.05, True)
+        flash_loan.record_trade(0.03, True)
+        flash_loan.record_trade(-0.01, False)
+        registry.register_strategy(flash_loan)
+        
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            registry.display_rankings()
+        
+        text = output.getvalue()
+        self.assertIn("Total Strategies: 1", text)
+        self.assertIn("Total Trades: 3", text)
+        self.assertIn("Net Profit: $0.07", text)
+        self.assertIn("Overall Win Rate: 66.7%", text)
+    
     def test_performance_report(self):
         """Test performance report generation."""
         registry = StrategyRegistry()
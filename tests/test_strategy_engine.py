@@ -25,6 +25,15 @@ class TestStrategyEngine(unittest.TestCase):
         self.assertIn('arbitrage', self.engine.active_strategies)
         self.assertTrue(self.engine.active_strategies['arbitrage']['enabled'])
     
+    def test_register_strategies(self):
+        """Test bulk strategy registration."""
+        self.engine.register_strategies([
+            (StrategyType.ARBITRAGE, {'threshold': 0.01}),
+            (StrategyType.MOMENTUM, {'momentum_threshold': 0.05}),
+        ])
+        self.assertEqual(set(self.engine.active_strategies), {'arbitrage', 'momentum'})
+        self.assertEqual(self.engine.active_strategies['momentum']['params'], {'momentum_threshold': 0.05})
+    
     def test_arbitrage_strategy(self):
         """Test arbitrage strategy execution."""
         self.engine.register_strategy(